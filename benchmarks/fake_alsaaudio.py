@@ -0,0 +1,212 @@
+"""An in-process fake of the parts of ``alsaaudio`` used by mopidy-alsamixer.
+
+Controls live in a shared registry, so that every ``Mixer`` opened on the same
+device and control sees the same state, like with a real sound card. Each
+mixer has a poll descriptor backed by an eventfd, which becomes readable when
+any mixer changes the control, and is drained by ``handleevents()``.
+
+Install the fake with :func:`install` before importing the mixer module.
+"""
+
+import os
+import select
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+
+PCM_PLAYBACK = 0
+PCM_CAPTURE = 1
+VOLUME_UNITS_PERCENTAGE = 0
+VOLUME_UNITS_RAW = 1
+VOLUME_UNITS_DB = 2
+MIXER_CHANNEL_ALL = -1
+
+
+class ALSAAudioError(Exception):
+    pass
+
+
+@dataclass
+class Control:
+    """State of a simulated mixer control."""
+
+    channels: int = 2
+    raw_range: tuple[int, int] = (0, 255)
+    # In hundredths of a dB, like ALSA. None if the control has no dB info.
+    db_range: tuple[int, int] | None = (-5100, 0)
+    has_mute: bool = True
+    # Simulated time taken by every call on a mixer, in seconds
+    latency: float = 0.0
+    raw_volumes: list[int] = field(default_factory=list)
+    mutes: list[int] = field(default_factory=list)
+    mixers: set["Mixer"] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self.raw_volumes = self.raw_volumes or [self.raw_range[1]] * self.channels
+        self.mutes = self.mutes or [0] * self.channels
+
+    def notify(self) -> None:
+        for mixer in list(self.mixers):
+            mixer.signal()
+
+
+# Simulated controls by device, then by control name
+devices: dict[str, dict[str, Control]] = {}
+
+
+def reset(controls: dict[str, dict[str, Control]] | None = None) -> None:
+    devices.clear()
+    devices.update(controls or {"default": {"Master": Control()}})
+
+
+def install() -> types.ModuleType:
+    """Make ``import alsaaudio`` return this module."""
+    reset()
+    module = sys.modules[__name__]
+    sys.modules["alsaaudio"] = module
+    return module
+
+
+def cards() -> list[str]:
+    return [device for device in devices if device.startswith("hw:")]
+
+
+def card_indexes() -> list[int]:
+    return [int(device.removeprefix("hw:")) for device in cards()]
+
+
+def card_name(index: int) -> tuple[str, str]:
+    return (f"Card{index}", f"Fake card {index}")
+
+
+def mixers(device: str = "default", **_kwargs: object) -> list[str]:
+    try:
+        return list(devices[device])
+    except KeyError:
+        msg = f"No such device: {device}"
+        raise ALSAAudioError(msg) from None
+
+
+class Mixer:
+    def __init__(self, control: str = "Master", device: str = "default") -> None:
+        try:
+            self._control = devices[device][control]
+        except KeyError:
+            msg = f"Unable to find mixer control {control},0"
+            raise ALSAAudioError(msg) from None
+        self._name = control
+        self._eventfd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        self._closed = False
+        self._control.mixers.add(self)
+
+    def _call(self) -> Control:
+        if self._closed:
+            msg = "Mixer is closed"
+            raise ALSAAudioError(msg)
+        if self._control.latency:
+            time.sleep(self._control.latency)
+        return self._control
+
+    def signal(self) -> None:
+        if not self._closed:
+            os.eventfd_write(self._eventfd, 1)
+
+    def mixer(self) -> str:
+        return self._name
+
+    def volumecap(self) -> list[str]:
+        return ["Volume", "Playback Volume"]
+
+    def switchcap(self) -> list[str]:
+        return ["Playback Mute"] if self._control.has_mute else []
+
+    def getrange(
+        self, pcmtype: int = PCM_PLAYBACK, units: int = VOLUME_UNITS_RAW
+    ) -> tuple[int, int]:
+        del pcmtype
+        control = self._call()
+        if units == VOLUME_UNITS_DB:
+            if control.db_range is None:
+                msg = "No dB information"
+                raise ALSAAudioError(msg)
+            return control.db_range
+        if units == VOLUME_UNITS_PERCENTAGE:
+            return (0, 100)
+        return control.raw_range
+
+    def getvolume(
+        self, pcmtype: int = PCM_PLAYBACK, units: int = VOLUME_UNITS_PERCENTAGE
+    ) -> list[int]:
+        del pcmtype
+        control = self._call()
+        with control.lock:
+            if units == VOLUME_UNITS_RAW:
+                return list(control.raw_volumes)
+            return [_raw_to_percentage(control, raw) for raw in control.raw_volumes]
+
+    def setvolume(
+        self,
+        volume: int,
+        channel: int = MIXER_CHANNEL_ALL,
+        pcmtype: int = PCM_PLAYBACK,
+        units: int = VOLUME_UNITS_PERCENTAGE,
+    ) -> None:
+        del pcmtype
+        control = self._call()
+        raw = (
+            volume if units == VOLUME_UNITS_RAW else _percentage_to_raw(control, volume)
+        )
+        with control.lock:
+            channels = range(control.channels) if channel < 0 else [channel]
+            for index in channels:
+                control.raw_volumes[index] = raw
+        control.notify()
+
+    def getmute(self) -> list[int]:
+        control = self._call()
+        if not control.has_mute:
+            msg = "Mixer has no mute switch"
+            raise ALSAAudioError(msg)
+        with control.lock:
+            return list(control.mutes)
+
+    def setmute(self, mute: int, channel: int = MIXER_CHANNEL_ALL) -> None:
+        control = self._call()
+        if not control.has_mute:
+            msg = "Mixer has no mute switch"
+            raise ALSAAudioError(msg)
+        with control.lock:
+            channels = range(control.channels) if channel < 0 else [channel]
+            for index in channels:
+                control.mutes[index] = int(mute)
+        control.notify()
+
+    def polldescriptors(self) -> list[tuple[int, int]]:
+        return [(self._eventfd, select.POLLIN)]
+
+    def handleevents(self) -> int:
+        self._call()
+        try:
+            return os.eventfd_read(self._eventfd)
+        except BlockingIOError:
+            return 0
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._control.mixers.discard(self)
+        os.close(self._eventfd)
+
+
+def _raw_to_percentage(control: Control, raw: int) -> int:
+    low, high = control.raw_range
+    return round((raw - low) * 100 / (high - low))
+
+
+def _percentage_to_raw(control: Control, volume: int) -> int:
+    low, high = control.raw_range
+    return low + round(volume * (high - low) / 100)
@@ -0,0 +1,296 @@
+"""Measure the runtime performance of mopidy-alsamixer.
+
+``alsaaudio`` is replaced with the in-process fake from ``fake_alsaaudio``, so
+no sound card is needed, and the cost of ALSA itself can be simulated with
+``--latency``. With ``--backend memory``, the in-memory mixer backend is used
+instead of the pyalsaaudio backend. The following is measured:
+
+- ``get_set``: latency of getting and setting volume and mute, with and
+  without the state cache.
+- ``observer``: time from a change made by another application until the
+  observer delivers it.
+- ``conversion``: throughput of the volume mappings of each volume scale.
+- ``burst``: actor mailbox depth and drain time when many changes arrive at
+  once, from clients and from other applications.
+- ``reads``: latency of reading the volume while the actor is busy with a
+  burst of writes, through the actor and from the published state.
+- ``scheduler``: cost of scheduling and cancelling many timed volume changes.
+
+Run with ``python benchmarks/mixer.py``. Results are written to stdout as
+JSON, with times in microseconds, and include the version of the extension,
+so that results can be compared between releases.
+"""
+
+import argparse
+import configparser
+import json
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, cast
+
+import fake_alsaaudio
+import pykka
+
+fake_alsaaudio.install()
+
+from mopidy_alsamixer import Extension  # noqa: E402
+from mopidy_alsamixer.backend import (  # noqa: E402
+    AlsaBackend,
+    MemoryBackend,
+    MemoryControl,
+    MixerBackend,
+    MixerHandle,
+)
+from mopidy_alsamixer.mixer import AlsaMixer, AlsaMixerObserver  # noqa: E402
+from mopidy_alsamixer.scheduler import Scheduler  # noqa: E402
+
+if TYPE_CHECKING:
+    import queue
+
+# Time to wait for an event before giving up, in seconds
+TIMEOUT = 5.0
+
+
+def get_config(**overrides: object) -> dict[str, Any]:
+    ext = Extension()
+    parser = configparser.RawConfigParser()
+    parser.read_string(ext.get_default_config())
+    values, errors = ext.get_config_schema().deserialize(dict(parser["alsamixer"]))
+    if errors:
+        msg = f"Invalid default config: {errors}"
+        raise SystemExit(msg)
+    values.update({"discovery_cache": False, "max_write_rate": 0}, **overrides)
+    return {"alsamixer": values}
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "median_us": statistics.median(samples),
+        "p95_us": samples[int(len(samples) * 0.95)],
+        "min_us": samples[0],
+        "max_us": samples[-1],
+    }
+
+
+def time_calls(func: Callable[[int], object], runs: int) -> dict[str, float]:
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return summarize(samples)
+
+
+def bench_get_set(backend: MixerBackend, runs: int) -> dict[str, Any]:
+    cached = AlsaMixer(config=get_config(), backend=backend)
+    uncached = AlsaMixer(config=get_config(cache_state=False), backend=backend)
+    results = {
+        "get_volume_cached": time_calls(lambda _: cached.get_volume(), runs),
+        "get_volume_uncached": time_calls(lambda _: uncached.get_volume(), runs),
+        "get_mute_cached": time_calls(lambda _: cached.get_mute(), runs),
+        "get_mute_uncached": time_calls(lambda _: uncached.get_mute(), runs),
+        # Alternate values, so that no write is skipped as unchanged
+        "set_volume": time_calls(lambda i: cached.set_volume(40 + i % 2), runs),
+        "set_mute": time_calls(lambda i: cached.set_mute(bool(i % 2)), runs),
+        "set_volume_unchanged": time_calls(lambda _: cached.set_volume(50), runs),
+    }
+    for mixer in (cached, uncached):
+        mixer.on_stop()
+    return results
+
+
+def bench_observer(backend: MixerBackend, runs: int) -> dict[str, Any]:
+    delivered = threading.Event()
+
+    def callback(_state: object) -> None:
+        delivered.set()
+
+    observer = AlsaMixerObserver(
+        device="default", control="Master", callback=callback, backend=backend
+    )
+    observer.start()
+    writer = backend.open("default", "Master")
+    samples = []
+    for i in range(runs):
+        delivered.clear()
+        start = time.perf_counter()
+        writer.write_volume(40 + i % 2)
+        if not delivered.wait(TIMEOUT):
+            msg = "Observer did not deliver change"
+            raise SystemExit(msg)
+        samples.append((time.perf_counter() - start) * 1e6)
+    observer.stop()
+    observer.close()
+    writer.close()
+    return {"event_to_notification": summarize(samples)}
+
+
+def bench_conversion(backend: MixerBackend, runs: int) -> dict[str, Any]:
+    results = {}
+    for volume_scale in ("linear", "cubic", "log", "raw", "db"):
+        mixer = AlsaMixer(config=get_config(volume_scale=volume_scale), backend=backend)
+        mixer_volumes = [mixer.volume_to_mixer_volume(v) for v in range(101)]
+        start = time.perf_counter()
+        for _ in range(runs):
+            for volume, mixer_volume in enumerate(mixer_volumes):
+                mixer.volume_to_mixer_volume(volume)
+                mixer.mixer_volume_to_volume(mixer_volume)
+        elapsed = time.perf_counter() - start
+        results[volume_scale] = {"conversions_per_s": runs * 101 * 2 / elapsed}
+        mixer.on_stop()
+    return results
+
+
+def measure_burst(
+    actor_ref: pykka.ActorRef[AlsaMixer], burst: Callable[[], list[pykka.Future[Any]]]
+) -> dict[str, float | int]:
+    # ThreadingActor uses a queue.Queue as its inbox
+    inbox = cast("queue.Queue[Any]", actor_ref.actor_inbox)
+    max_depth = 0
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal max_depth
+        while not done.is_set():
+            max_depth = max(max_depth, inbox.qsize())
+            time.sleep(0.0001)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    futures = burst()
+    for future in futures:
+        future.get(timeout=TIMEOUT)
+    # Wait for messages from the observer to be processed as well
+    actor_ref.proxy().get_volume().get(timeout=TIMEOUT)
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    return {"max_mailbox_depth": max_depth, "drain_us": elapsed * 1e6}
+
+
+def bench_burst(backend: MixerBackend, size: int) -> dict[str, Any]:
+    results = {}
+    for coalesce_window in (0, 50):
+        actor_ref = AlsaMixer.start(
+            config=get_config(coalesce_window=coalesce_window), backend=backend
+        )
+        proxy = actor_ref.proxy()
+        writer = backend.open("default", "Master")
+        settle_time = coalesce_window / 1000 + 0.01
+
+        def from_clients(
+            proxy: pykka.ActorProxy[AlsaMixer] = proxy,
+        ) -> list[pykka.Future[Any]]:
+            return [proxy.set_volume(i % 100) for i in range(size)]
+
+        def from_others(
+            writer: MixerHandle = writer, settle_time: float = settle_time
+        ) -> list[pykka.Future[Any]]:
+            for i in range(size):
+                writer.write_volume(i % 100)
+            # Give the observer time to notice the last change
+            time.sleep(settle_time)
+            return []
+
+        results[f"coalesce_window_{coalesce_window}"] = {
+            "clients": measure_burst(actor_ref, from_clients),
+            "other_applications": measure_burst(actor_ref, from_others),
+        }
+        writer.close()
+        actor_ref.stop()
+    return results
+
+
+def bench_reads(backend: MixerBackend, size: int, runs: int) -> dict[str, Any]:
+    actor_ref = AlsaMixer.start(config=get_config(), backend=backend)
+    proxy = actor_ref.proxy()
+    publisher = proxy.get_state_publisher().get(timeout=TIMEOUT)
+    futures = [proxy.set_volume(i % 100) for i in range(size)]
+    published = time_calls(lambda _: publisher.current.volume, runs)
+    start = time.perf_counter()
+    proxy.get_volume().get(timeout=TIMEOUT)
+    through_actor = (time.perf_counter() - start) * 1e6
+    for future in futures:
+        future.get(timeout=TIMEOUT)
+    actor_ref.stop()
+    return {"published": published, "through_actor_us": through_actor}
+
+
+def bench_scheduler(size: int) -> dict[str, Any]:
+    # Far enough in the future that nothing runs during the benchmark
+    when = time.time() + 3600
+    scheduler = Scheduler(run=lambda _action: None)
+    try:
+        start = time.perf_counter()
+        actions = [
+            scheduler.schedule(
+                when + i, volume=i % 101, interval=86400 if i % 2 else None
+            )
+            for i in range(size)
+        ]
+        schedule_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        for action in actions:
+            scheduler.cancel(action.id)
+        cancel_elapsed = time.perf_counter() - start
+    finally:
+        scheduler.close()
+    return {
+        "schedule_us": schedule_elapsed / size * 1e6,
+        "cancel_us": cancel_elapsed / size * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--burst", type=int, default=1000)
+    parser.add_argument("--scheduled", type=int, default=10000)
+    parser.add_argument("--backend", choices=("alsa", "memory"), default="alsa")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="simulated latency of every ALSA call, in microseconds",
+    )
+    args = parser.parse_args()
+
+    backend: MixerBackend
+    if args.backend == "memory":
+        backend = MemoryBackend(
+            {"default": {"Master": MemoryControl()}}, latency=args.latency / 1e6
+        )
+    else:
+        fake_alsaaudio.reset(
+            {"default": {"Master": fake_alsaaudio.Control(latency=args.latency / 1e6)}}
+        )
+        backend = AlsaBackend()
+    results = {
+        "benchmark": "mixer",
+        "version": Extension.version,
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "burst": args.burst,
+        "scheduled": args.scheduled,
+        "backend": args.backend,
+        "latency_us": args.latency,
+        "results": {
+            "get_set": bench_get_set(backend, args.runs),
+            "observer": bench_observer(backend, args.runs),
+            "conversion": bench_conversion(backend, args.runs),
+            "burst": bench_burst(backend, args.burst),
+            "reads": bench_reads(backend, args.burst, args.runs),
+            "scheduler": bench_scheduler(args.scheduled),
+        },
+    }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
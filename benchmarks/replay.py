@@ -0,0 +1,76 @@
+"""Replay a recorded ALSA mixer event stream through the mixer.
+
+Recordings are made with the ``alsamixer/record_events`` config value. The
+recorded control is simulated with the in-memory mixer backend, and an
+``AlsaMixer`` actor with metrics enabled observes it while the recording is
+replayed, so that the coalescing and notification behaviour can be measured.
+
+Run with ``python benchmarks/replay.py RECORDING``. Results are written to
+stdout as JSON, with the mixer stats as returned by ``get_stats()``.
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+from mixer import get_config
+
+from mopidy_alsamixer.mixer import AlsaMixer
+from mopidy_alsamixer.replay import make_backend, read_recording, replay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("recording", type=pathlib.Path)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed factor, or 0 to replay as fast as possible",
+    )
+    parser.add_argument("--coalesce-window", type=int, default=50)
+    parser.add_argument("--volume-scale", default="cubic")
+    args = parser.parse_args()
+
+    header, events = read_recording(args.recording)
+    backend = make_backend(header, events)
+    config = get_config(
+        device=header.device,
+        control=header.control,
+        volume_scale=args.volume_scale,
+        coalesce_window=args.coalesce_window,
+        metrics=True,
+    )
+    actor_ref = AlsaMixer.start(config=config, backend=backend)
+    proxy = actor_ref.proxy()
+    # Replayed events are only seen once on_start has set up the observer
+    if not proxy.is_observing().get():
+        actor_ref.stop()
+        msg = f"Could not observe {header.device}|{header.control}"
+        raise SystemExit(msg)
+
+    start = time.perf_counter()
+    count = replay(args.recording, backend, speed=args.speed)
+    duration = time.perf_counter() - start
+    # Let the observer deliver the end of the last burst
+    time.sleep(args.coalesce_window / 1000 + 0.1)
+    stats = proxy.get_stats().get()
+    actor_ref.stop()
+
+    results = {
+        "benchmark": "replay",
+        "recording": str(args.recording),
+        "events": count,
+        "speed": args.speed,
+        "coalesce_window_ms": args.coalesce_window,
+        "duration_s": duration,
+        "results": stats,
+    }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Measure the cold start cost of mopidy-alsamixer.
+
+Each sample runs in a fresh Python process, and measures importing the mixer
+module through ``Extension.setup()`` and constructing ``AlsaMixer`` with the
+default config. ``alsaaudio`` is replaced with a stub, so no sound card is
+needed. Startup is measured both with an empty discovery cache and with one
+filled by an earlier start.
+
+Run with ``python benchmarks/startup.py``. Results are written to stdout as
+JSON, with times in milliseconds.
+"""
+
+import argparse
+import configparser
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+
+def measure(cache_dir: str) -> dict[str, float]:
+    alsaaudio = mock.Mock()
+    alsaaudio.mixers.return_value = ["Master"]
+    sys.modules["alsaaudio"] = alsaaudio
+
+    from mopidy_alsamixer import Extension  # noqa: PLC0415
+
+    ext = Extension()
+    parser = configparser.RawConfigParser()
+    parser.read_string(ext.get_default_config())
+    values, errors = ext.get_config_schema().deserialize(dict(parser["alsamixer"]))
+    if errors:
+        msg = f"Invalid default config: {errors}"
+        raise SystemExit(msg)
+
+    registry = mock.Mock()
+    start = time.perf_counter()
+    ext.setup(registry)
+    setup_done = time.perf_counter()
+    mixer_class = registry.add.call_args.args[1]
+    mixer_class(config={"alsamixer": values, "core": {"cache_dir": Path(cache_dir)}})
+    init_done = time.perf_counter()
+
+    return {
+        "setup": (setup_done - start) * 1000,
+        "init": (init_done - setup_done) * 1000,
+        "total": (init_done - start) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--child", metavar="CACHE_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        json.dump(measure(args.child), sys.stdout)
+        return
+
+    def run_child(cache_dir: str) -> dict[str, float]:
+        return json.loads(
+            subprocess.run(  # noqa: S603
+                [sys.executable, __file__, "--child", cache_dir],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+
+    samples = []
+    with tempfile.TemporaryDirectory() as warm_dir:
+        # Fill the discovery cache used by the cached runs
+        run_child(warm_dir)
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as cold_dir:
+                uncached = run_child(cold_dir)
+            cached = run_child(warm_dir)
+            samples.append(
+                {
+                    **{f"{key}_uncached": value for key, value in uncached.items()},
+                    **{f"{key}_cached": value for key, value in cached.items()},
+                }
+            )
+    results = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "results": {
+            key: {
+                "median_ms": statistics.median(sample[key] for sample in samples),
+                "min_ms": min(sample[key] for sample in samples),
+                "max_ms": max(sample[key] for sample in samples),
+            }
+            for key in samples[0]
+        },
+    }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,9 +20,23 @@ class Extension(ext.Extension):
         schema["device"] = config.String()
         schema["card"] = config.Integer(optional=True, minimum=0)
         schema["control"] = config.String()
+        schema["linked_controls"] = config.List(optional=True)
+        schema["channel_offsets"] = config.List(optional=True)
+        schema["discovery_cache"] = config.Boolean()
         schema["min_volume"] = config.Integer(minimum=0, maximum=100)
         schema["max_volume"] = config.Integer(minimum=0, maximum=100)
-        schema["volume_scale"] = config.String(choices=("linear", "cubic", "log"))
+        schema["volume_scale"] = config.String(
+            choices=("linear", "cubic", "log", "raw", "db")
+        )
+        schema["coalesce_window"] = config.Integer(minimum=0)
+        schema["cache_state"] = config.Boolean()
+        schema["max_write_rate"] = config.Integer(minimum=0)
+        schema["ramp_threshold"] = config.Integer(minimum=0, maximum=100)
+        schema["ramp_time"] = config.Integer(minimum=0)
+        schema["metrics"] = config.Boolean()
+        schema["metrics_log_interval"] = config.Integer(minimum=0)
+        schema["record_events"] = config.Path(optional=True)
+        schema["shared_state"] = config.Path(optional=True)
         return schema
 
     def setup(self, registry: ext.Registry) -> None:
@@ -0,0 +1,409 @@
+import abc
+import contextlib
+import logging
+import os
+import select
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import override
+
+import alsaaudio
+
+logger = logging.getLogger(__name__)
+
+
+class BackendError(Exception):
+    """A mixer backend operation failed."""
+
+
+@dataclass(frozen=True, slots=True)
+class MixerState:
+    """Volume and mute state of all channels, as read from ALSA."""
+
+    volumes: tuple[int, ...]
+
+    # None if the control does not have a mute switch
+    mutes: tuple[int, ...] | None
+
+
+class MixerHandle(abc.ABC):
+    """An open mixer control.
+
+    Volumes are percentages, or the control's raw hardware units if ``raw`` is
+    true. All methods raise :class:`BackendError` on failure.
+    """
+
+    @abc.abstractmethod
+    def volume_range(self) -> tuple[int, int]:
+        """Return the raw volume range of the control."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def db_range(self) -> tuple[int, int]:
+        """Return the dB range of the control, in hundredths of a dB."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_volumes(self, *, raw: bool = False) -> list[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_mutes(self) -> list[int]:
+        raise NotImplementedError
+
+    def read_state(self, *, raw: bool = False) -> MixerState:
+        volumes = tuple(self.read_volumes(raw=raw))
+        try:
+            mutes = tuple(self.read_mutes())
+        except BackendError as exc:
+            logger.debug(f"Getting mute state failed: {exc}")
+            mutes = None
+        return MixerState(volumes=volumes, mutes=mutes)
+
+    @abc.abstractmethod
+    def write_volume(self, volume: int, *, raw: bool = False) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write_volumes(self, volumes: Sequence[int], *, raw: bool = False) -> None:
+        """Set each channel to its own volume, in channel order."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write_mute(self, mute: bool) -> None:  # noqa: FBT001
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def poll_descriptors(self) -> list[tuple[int, int]]:
+        """Return descriptors that become readable when the control changes."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def drain_events(self) -> None:
+        """Handle pending events, so that reads return the current state."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class MixerBackend(abc.ABC):
+    """Access to the sound cards and mixer controls of the system."""
+
+    @abc.abstractmethod
+    def list_cards(self) -> list[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def card_indexes(self) -> list[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_controls(self, device: str) -> list[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def open(self, device: str, control: str) -> MixerHandle:
+        raise NotImplementedError
+
+
+@contextlib.contextmanager
+def _translate_errors() -> Iterator[None]:
+    try:
+        yield
+    except alsaaudio.ALSAAudioError as exc:
+        raise BackendError(str(exc)) from exc
+
+
+class AlsaHandle(MixerHandle):
+    def __init__(self, mixer: alsaaudio.Mixer) -> None:
+        self.mixer = mixer
+
+    @override
+    def volume_range(self) -> tuple[int, int]:
+        with _translate_errors():
+            return self.mixer.getrange(units=alsaaudio.VOLUME_UNITS_RAW)
+
+    @override
+    def db_range(self) -> tuple[int, int]:
+        with _translate_errors():
+            return self.mixer.getrange(units=alsaaudio.VOLUME_UNITS_DB)
+
+    @override
+    def read_volumes(self, *, raw: bool = False) -> list[int]:
+        with _translate_errors():
+            if raw:
+                return self.mixer.getvolume(units=alsaaudio.VOLUME_UNITS_RAW)
+            return self.mixer.getvolume()
+
+    @override
+    def read_mutes(self) -> list[int]:
+        with _translate_errors():
+            return self.mixer.getmute()
+
+    @override
+    def write_volume(self, volume: int, *, raw: bool = False) -> None:
+        with _translate_errors():
+            if raw:
+                self.mixer.setvolume(volume, units=alsaaudio.VOLUME_UNITS_RAW)
+            else:
+                self.mixer.setvolume(volume)
+
+    @override
+    def write_volumes(self, volumes: Sequence[int], *, raw: bool = False) -> None:
+        units = alsaaudio.VOLUME_UNITS_RAW if raw else alsaaudio.VOLUME_UNITS_PERCENTAGE
+        with _translate_errors():
+            for channel, volume in enumerate(volumes):
+                self.mixer.setvolume(volume, channel=channel, units=units)
+
+    @override
+    def write_mute(self, mute: bool) -> None:
+        with _translate_errors():
+            self.mixer.setmute(int(mute))
+
+    @override
+    def poll_descriptors(self) -> list[tuple[int, int]]:
+        with _translate_errors():
+            return self.mixer.polldescriptors()
+
+    @override
+    def drain_events(self) -> None:
+        with _translate_errors():
+            self.mixer.handleevents()
+
+    @override
+    def close(self) -> None:
+        with _translate_errors():
+            self.mixer.close()
+
+
+class AlsaBackend(MixerBackend):
+    """The default backend, using pyalsaaudio."""
+
+    @override
+    def list_cards(self) -> list[str]:
+        with _translate_errors():
+            return alsaaudio.cards()
+
+    @override
+    def card_indexes(self) -> list[int]:
+        with _translate_errors():
+            return alsaaudio.card_indexes()
+
+    @override
+    def list_controls(self, device: str) -> list[str]:
+        with _translate_errors():
+            return list(alsaaudio.mixers(device=device))
+
+    @override
+    def open(self, device: str, control: str) -> AlsaHandle:
+        with _translate_errors():
+            return AlsaHandle(alsaaudio.Mixer(device=device, control=control))
+
+
+@dataclass
+class MemoryControl:
+    """A simulated mixer control of a :class:`MemoryBackend`."""
+
+    channels: int = 2
+    raw_range: tuple[int, int] = (0, 255)
+
+    # None if the control has no dB information
+    db_range: tuple[int, int] | None = (-5100, 0)
+
+    has_mute: bool = True
+
+    # If set, every operation on the control fails with this message
+    error: str | None = None
+
+    raw_volumes: list[int] = field(default_factory=list)
+    mutes: list[int] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.raw_volumes = self.raw_volumes or [self.raw_range[1]] * self.channels
+        self.mutes = self.mutes or [0] * self.channels
+        self._handles: set[MemoryHandle] = set()
+        self._lock = threading.Lock()
+
+    def signal(self) -> None:
+        """Wake up everyone polling a handle of this control."""
+        for handle in list(self._handles):
+            handle._signal()  # noqa: SLF001
+
+
+class MemoryHandle(MixerHandle):
+    def __init__(self, backend: "MemoryBackend", control: MemoryControl) -> None:
+        self.backend = backend
+        self.control = control
+        self._eventfd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        self._closed = False
+        control._handles.add(self)  # noqa: SLF001
+
+    def _check(self) -> MemoryControl:
+        if self._closed:
+            msg = "Mixer is closed"
+            raise BackendError(msg)
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        if self.control.error is not None:
+            raise BackendError(self.control.error)
+        return self.control
+
+    def _signal(self) -> None:
+        if not self._closed:
+            os.eventfd_write(self._eventfd, 1)
+
+    def _to_raw(self, volume: int) -> int:
+        low, high = self.control.raw_range
+        return low + round(volume * (high - low) / 100)
+
+    def _from_raw(self, raw: int) -> int:
+        low, high = self.control.raw_range
+        return round((raw - low) * 100 / (high - low))
+
+    @override
+    def volume_range(self) -> tuple[int, int]:
+        return self._check().raw_range
+
+    @override
+    def db_range(self) -> tuple[int, int]:
+        control = self._check()
+        if control.db_range is None:
+            msg = "Control has no dB information"
+            raise BackendError(msg)
+        return control.db_range
+
+    @override
+    def read_volumes(self, *, raw: bool = False) -> list[int]:
+        control = self._check()
+        with control._lock:  # noqa: SLF001
+            volumes = list(control.raw_volumes)
+        return volumes if raw else [self._from_raw(volume) for volume in volumes]
+
+    @override
+    def read_mutes(self) -> list[int]:
+        control = self._check()
+        if not control.has_mute:
+            msg = "Control has no mute switch"
+            raise BackendError(msg)
+        with control._lock:  # noqa: SLF001
+            return list(control.mutes)
+
+    @override
+    def write_volume(self, volume: int, *, raw: bool = False) -> None:
+        control = self._check()
+        with control._lock:  # noqa: SLF001
+            control.raw_volumes = [volume if raw else self._to_raw(volume)] * len(
+                control.raw_volumes
+            )
+        self.control.signal()
+
+    @override
+    def write_volumes(self, volumes: Sequence[int], *, raw: bool = False) -> None:
+        control = self._check()
+        with control._lock:  # noqa: SLF001
+            control.raw_volumes = [
+                volume if raw else self._to_raw(volume) for volume in volumes
+            ]
+        self.control.signal()
+
+    @override
+    def write_mute(self, mute: bool) -> None:
+        control = self._check()
+        if not control.has_mute:
+            msg = "Control has no mute switch"
+            raise BackendError(msg)
+        with control._lock:  # noqa: SLF001
+            control.mutes = [int(mute)] * len(control.mutes)
+        self.control.signal()
+
+    def write_state(self, state: MixerState, *, raw: bool = False) -> None:
+        """Set every channel separately, like another application could."""
+        control = self._check()
+        with control._lock:  # noqa: SLF001
+            control.raw_volumes = [
+                volume if raw else self._to_raw(volume) for volume in state.volumes
+            ]
+            if state.mutes is not None:
+                control.mutes = list(state.mutes)
+        self.control.signal()
+
+    @override
+    def poll_descriptors(self) -> list[tuple[int, int]]:
+        return [(self._eventfd, select.POLLIN)]
+
+    @override
+    def drain_events(self) -> None:
+        self._check()
+        with contextlib.suppress(BlockingIOError):
+            os.eventfd_read(self._eventfd)
+
+    @override
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.control._handles.discard(self)  # noqa: SLF001
+        os.close(self._eventfd)
+
+
+class MemoryBackend(MixerBackend):
+    """A backend simulating mixer controls in memory.
+
+    Handles opened on the same control share its state, and are notified
+    through their poll descriptors when another handle changes it. Used for
+    tests and load simulation.
+    """
+
+    def __init__(
+        self,
+        devices: dict[str, dict[str, MemoryControl]] | None = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.devices = (
+            devices if devices is not None else {"default": {"Master": MemoryControl()}}
+        )
+        # Simulated time taken by every operation on a handle, in seconds
+        self.latency = latency
+        self.opened = 0
+
+    @override
+    def list_cards(self) -> list[str]:
+        return [device for device in self.devices if device.startswith("hw:")]
+
+    @override
+    def card_indexes(self) -> list[int]:
+        return [int(device.removeprefix("hw:")) for device in self.list_cards()]
+
+    @override
+    def list_controls(self, device: str) -> list[str]:
+        try:
+            return list(self.devices[device])
+        except KeyError:
+            msg = f"No such device: {device}"
+            raise BackendError(msg) from None
+
+    @override
+    def open(self, device: str, control: str) -> MemoryHandle:
+        try:
+            memory_control = self.devices[device][control]
+        except KeyError:
+            msg = f"No mixer control {control!r} on device {device!r}"
+            raise BackendError(msg) from None
+        if memory_control.error is not None:
+            raise BackendError(memory_control.error)
+        self.opened += 1
+        return MemoryHandle(self, memory_control)
+
+    def unplug(self, device: str) -> None:
+        """Make all controls of a device fail, like an unplugged soundcard."""
+        for control in self.devices[device].values():
+            control.error = "No such device"
+            control.signal()
+
+    def replug(self, device: str) -> None:
+        for control in self.devices[device].values():
+            control.error = None
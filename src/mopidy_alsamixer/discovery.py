@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import pathlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from mopidy_alsamixer.backend import BackendError, MixerBackend
+
+logger = logging.getLogger(__name__)
+
+CARDS_PATH = pathlib.Path("/proc/asound/cards")
+
+# Maximum number of threads used to probe cards and controls
+PROBE_WORKERS = 8
+
+# Preferred control names when probing, best first
+PREFERRED_CONTROLS = ("Master", "PCM", "Speaker", "Headphone", "Digital")
+
+
+def fingerprint(cards_path: pathlib.Path = CARDS_PATH) -> str | None:
+    """Return a fingerprint of the set of sound cards in the system.
+
+    Returns :class:`None` if the set of sound cards can't be determined, in
+    which case nothing should be cached.
+    """
+    try:
+        return hashlib.sha256(cards_path.read_bytes()).hexdigest()
+    except OSError as exc:
+        logger.debug(f"Reading {cards_path} failed: {exc}")
+        return None
+
+
+class DiscoveryCache:
+    """Known mixer controls per ALSA device, persisted between restarts.
+
+    The cache is only valid as long as the set of sound cards stays the same.
+    If the fingerprint of the sound cards changes, the cache starts out empty.
+    """
+
+    def __init__(
+        self, path: pathlib.Path, cards_path: pathlib.Path = CARDS_PATH
+    ) -> None:
+        self.path = path
+        self.fingerprint = fingerprint(cards_path)
+        self._controls: dict[str, list[str]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, list[str]]:
+        if self.fingerprint is None:
+            return {}
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.debug(f"Loading ALSA discovery cache failed: {exc}")
+            return {}
+        if not isinstance(data, dict) or data.get("fingerprint") != self.fingerprint:
+            return {}
+        controls = data.get("controls")
+        return controls if isinstance(controls, dict) else {}
+
+    def get_controls(self, device: str) -> list[str] | None:
+        return self._controls.get(device)
+
+    def set_controls(self, device: str, controls: list[str]) -> None:
+        if self._controls.get(device) != controls:
+            self._controls[device] = controls
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.fingerprint is None or not self._dirty:
+            return
+        data = {"fingerprint": self.fingerprint, "controls": self._controls}
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(data))
+            tmp_path.replace(self.path)
+        except OSError as exc:
+            logger.debug(f"Saving ALSA discovery cache failed: {exc}")
+            return
+        self._dirty = False
+
+    def invalidate(self) -> None:
+        self._controls = {}
+        self._dirty = False
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.debug(f"Removing ALSA discovery cache failed: {exc}")
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    device: str
+    control: str
+    score: int
+
+
+def probe(
+    backend: MixerBackend, devices: Sequence[str], controls: Sequence[str] = ()
+) -> ProbeResult | None:
+    """Find the best mixer control for volume control on the given devices.
+
+    All devices, and then all controls on them, are probed concurrently. If
+    ``controls`` is given, only controls with those names are considered.
+    Returns :class:`None` if no control with playback volume was found.
+    """
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+    with ThreadPoolExecutor(
+        max_workers=PROBE_WORKERS, thread_name_prefix="AlsaMixerProbe"
+    ) as executor:
+        device_controls = executor.map(
+            lambda device: _list_controls(backend, device), devices
+        )
+        pairs = [
+            (device, control)
+            for device, found in zip(devices, device_controls, strict=True)
+            for control in found
+            if not controls or control in controls
+        ]
+        scores = list(executor.map(lambda pair: _score_control(backend, *pair), pairs))
+
+    results = [
+        ProbeResult(device=device, control=control, score=score)
+        for (device, control), score in zip(pairs, scores, strict=True)
+        if score is not None
+    ]
+    for result in results:
+        logger.debug(
+            f"Probed ALSA mixer control {result.control!r} on device "
+            f"{result.device!r}: score {result.score}"
+        )
+    # max() returns the first of equally good results, keeping config order
+    return max(results, key=lambda result: result.score, default=None)
+
+
+def _list_controls(backend: MixerBackend, device: str) -> list[str]:
+    try:
+        return backend.list_controls(device)
+    except BackendError as exc:
+        logger.debug(f"Listing ALSA mixer controls on {device!r} failed: {exc}")
+        return []
+
+
+def _score_control(backend: MixerBackend, device: str, control: str) -> int | None:
+    try:
+        handle = backend.open(device, control)
+    except BackendError as exc:
+        logger.debug(f"Opening ALSA mixer control {control!r} failed: {exc}")
+        return None
+    try:
+        # Controls without playback volume have no usable volume range
+        low, high = handle.volume_range()
+        if high <= low:
+            return None
+        score = 100
+        channels = len(handle.read_volumes(raw=True))
+        score += 5 * min(channels, 2)
+        try:
+            handle.read_mutes()
+            score += 10
+        except BackendError:
+            pass
+        for i, name in enumerate(PREFERRED_CONTROLS):
+            if control.lower().startswith(name.lower()):
+                score += 10 * (len(PREFERRED_CONTROLS) - i)
+                break
+    except BackendError as exc:
+        logger.debug(f"Probing ALSA mixer control {control!r} failed: {exc}")
+        return None
+    finally:
+        handle.close()
+    return score
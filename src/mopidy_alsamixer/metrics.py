@@ -0,0 +1,151 @@
+import bisect
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, Concatenate, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in microseconds. Larger
+# values go into an extra overflow bucket.
+BUCKET_BOUNDS_US = (
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    25_000,
+    50_000,
+    100_000,
+)
+
+
+class Histogram:
+    """Latency distribution of an operation, in fixed buckets."""
+
+    __slots__ = ("buckets", "count", "max_us", "total_us")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def add(self, value_us: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_US, value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        self.max_us = max(self.max_us, value_us)
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"<={bound}us" for bound in BUCKET_BOUNDS_US]
+        labels.append(f">{BUCKET_BOUNDS_US[-1]}us")
+        return {
+            "count": self.count,
+            "mean_us": self.total_us / self.count if self.count else 0.0,
+            "max_us": self.max_us,
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class Metrics:
+    """Counters and latency histograms, shared between threads.
+
+    If disabled, recording anything is a no-op.
+    """
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._histograms: dict[str, Histogram] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(seconds * 1e6)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "latency": {
+                    name: histogram.snapshot()
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+
+class _HasMetrics(Protocol):
+    metrics: Metrics
+
+
+def timed[T: _HasMetrics, **P, R](
+    name: str,
+) -> Callable[[Callable[Concatenate[T, P], R]], Callable[Concatenate[T, P], R]]:
+    """Record the latency of a method in the ``name`` histogram of its object."""
+
+    def decorator(
+        func: Callable[Concatenate[T, P], R],
+    ) -> Callable[Concatenate[T, P], R]:
+        @functools.wraps(func)
+        def wrapper(self: T, *args: P.args, **kwargs: P.kwargs) -> R:
+            if not self.metrics.enabled:
+                return func(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self.metrics.observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def format_stats(stats: dict[str, Any]) -> str:
+    """Format the output of :meth:`Metrics.snapshot` as a single line."""
+    parts = [f"{name}={value}" for name, value in sorted(stats["counters"].items())]
+    parts.extend(
+        f"{name}={histogram['count']}x{histogram['mean_us']:.0f}us"
+        f"(max {histogram['max_us']:.0f}us)"
+        for name, histogram in sorted(stats["latency"].items())
+    )
+    return " ".join(parts)
+
+
+class MetricsLogger(threading.Thread):
+    """Logs stats at debug level every ``interval`` seconds until stopped."""
+
+    daemon = True
+    name = "AlsaMixerMetrics"
+
+    def __init__(self, stats: Callable[[], dict[str, Any]], interval: float) -> None:
+        super().__init__()
+        self.stats = stats
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            logger.debug(f"ALSA mixer stats: {format_stats(self.stats())}")
@@ -1,167 +1,1103 @@
+import bisect
+import contextlib
+import functools
+import itertools
 import logging
 import math
+import pathlib
 import select
 import threading
-from collections.abc import Callable
-from typing import Literal, cast, override
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal, cast, override
 
-import alsaaudio
-import gi
 import pykka
+from mopidy import exceptions, mixer
 from mopidy.types import Percentage
 
-gi.require_version("GstAudio", "1.0")
-from gi.repository import GstAudio  # noqa: E402, I001  # pyright: ignore[reportAttributeAccessIssue]
+from mopidy_alsamixer.backend import (
+    AlsaBackend,
+    BackendError,
+    MixerBackend,
+    MixerHandle,
+    MixerState,
+)
+from mopidy_alsamixer.discovery import DiscoveryCache, probe
+from mopidy_alsamixer.metrics import Metrics, MetricsLogger, timed
+from mopidy_alsamixer.reactor import (
+    Reactor,
+    ReactorTimer,
+    acquire_shared_reactor,
+    release_shared_reactor,
+)
+from mopidy_alsamixer.state import StatePublisher
 
-from mopidy import exceptions, mixer  # noqa: E402
+if TYPE_CHECKING:
+    import concurrent.futures
 
+    from mopidy.config import Config
+
+    from mopidy_alsamixer.replay import EventRecorder
+    from mopidy_alsamixer.scheduler import ScheduledAction, Scheduler
+    from mopidy_alsamixer.shared import SharedObserver
 
 logger = logging.getLogger(__name__)
 
+# Per-channel offsets, mixer volumes of all channels for each volume, and the
+# reverse mapping of those rows to volumes
+type ChannelTables = tuple[
+    tuple[int, ...],
+    tuple[tuple[int, ...], ...] | None,
+    dict[tuple[int, ...], Percentage],
+]
+
+# Value of the device and control config values that enables probing
+AUTO = "auto"
+
+# dB ranges up to this size, in hundredths of a dB, are mapped linearly
+MAX_LINEAR_DB_SCALE = 2400
+
+# dB minimum reported by controls that mute at their lowest step, as defined
+# by SND_CTL_TLV_DB_GAIN_MUTE in alsa-lib
+DB_GAIN_MUTE = -9999999
+
+# Time between volume steps when fading, in seconds
+FADE_STEP_INTERVAL = 0.05
+
+# Bounds of the exponential backoff between attempts to reopen a lost
+# device, in seconds
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class LinkedControl:
+    """Another ALSA control that follows the volume and mute of the mixer."""
+
+    device: str
+    control: str
+
+    # Added to the mixer volume written to this control
+    offset: int = 0
+
+    @classmethod
+    def parse(cls, value: str) -> "LinkedControl":
+        """Parse a ``device|control`` or ``device|control|offset`` string."""
+        parts = value.split("|")
+        if len(parts) not in (2, 3) or not all(parts[:2]):
+            msg = (
+                f"Invalid linked control {value!r}, "
+                "expected device|control or device|control|offset"
+            )
+            raise ValueError(msg)
+        offset = int(parts[2]) if len(parts) == 3 else 0  # noqa: PLR2004
+        return cls(device=parts[0], control=parts[1], offset=offset)
+
 
 class AlsaMixer(pykka.ThreadingActor, mixer.Mixer):
     name = "alsamixer"
 
     @override
-    def __init__(self, config: dict) -> None:
+    def __init__(self, config: dict, backend: MixerBackend | None = None) -> None:
         super().__init__(config)
         self.config = config
+        self.backend = backend if backend is not None else AlsaBackend()
         self.control = cast("str", self.config["alsamixer"]["control"])
         self.device = cast("str", self.config["alsamixer"]["device"])
         card = cast("int | None", self.config["alsamixer"]["card"])
         self.min_volume = cast("Percentage", self.config["alsamixer"]["min_volume"])
         self.max_volume = cast("Percentage", self.config["alsamixer"]["max_volume"])
-        self.volume_scale: Literal["linear", "cubic", "log"] = self.config["alsamixer"][
-            "volume_scale"
-        ]
+        self.volume_scale: Literal["linear", "cubic", "log", "raw", "db"] = self.config[
+            "alsamixer"
+        ]["volume_scale"]
+        self.coalesce_window = cast("int", self.config["alsamixer"]["coalesce_window"])
+        self.cache_state = cast("bool", self.config["alsamixer"]["cache_state"])
+        self.max_write_rate = cast("int", self.config["alsamixer"]["max_write_rate"])
+        self.ramp_threshold = cast("int", self.config["alsamixer"]["ramp_threshold"])
+        self.ramp_time = cast("int", self.config["alsamixer"]["ramp_time"])
+        self.channel_offsets = _parse_channel_offsets(
+            self.config["alsamixer"]["channel_offsets"] or ()
+        )
+        self.metrics = Metrics(enabled=self.config["alsamixer"]["metrics"])
+        self.linked_controls = _parse_linked_controls(
+            self.config["alsamixer"]["linked_controls"] or ()
+        )
 
         self.device_title = f"device {self.device!r}"
         if card is not None:
             self.device = f"hw:{card:d}"
             self.device_title = f"card {card:d}"
 
-        known_cards = alsaaudio.cards()
-        try:
-            known_controls = alsaaudio.mixers(device=self.device)
-        except alsaaudio.ALSAAudioError as exc:
-            msg = (
-                f"Could not find ALSA {self.device_title}. "
-                "Known soundcards include: "
-                f"{', '.join(known_cards)}"
-            )
-            raise exceptions.MixerError(msg) from exc
+        if AUTO in (self.device, self.control):
+            self._probe_control()
 
-        if self.control not in known_controls:
-            msg = (
-                "Could not find ALSA mixer control "
-                f"{self.control} on {self.device_title}. "
-                f"Known mixers on {self.device_title} include: "
-                f"{', '.join(known_controls)}"
-            )
-            raise exceptions.MixerError(msg)
+        self._discovery = self._open_discovery_cache()
+        self._check_controls()
+
+        # Index 0 is our own control, followed by the linked controls
+        self._mixer_handles: list[MixerHandle | None] = [None] * (
+            1 + len(self.linked_controls)
+        )
+
+        # Indexes in linked_controls of the controls the observer has lost.
+        # They are left out of writes until they come back.
+        self._lost_linked: set[int] = set()
+
+        self._write_executor = self._make_write_executor()
+
+        # Last known state of the mixer, kept up to date by the observer and
+        # by our own writes. None if the cache is disabled, cold, or invalid.
+        self._cached_state: MixerState | None = None
+
+        # With a native volume scale, our own control is read and written in
+        # raw units instead of percentages.
+        self._raw_volume = False
+        self._build_volume_tables()
+
+        # Volume changes are written at most max_write_rate times per second.
+        # Requests arriving faster than that replace each other, and only the
+        # latest one is written when the timer fires. Timers run on the
+        # shared reactor, which is acquired on first use.
+        self._pending_volume: Percentage | None = None
+        self._next_write_time = 0.0
+        self._write_timer: ReactorTimer | None = None
+        self._reactor: Reactor | None = None
+
+        # Fades are stepped by a VolumeFader on the reactor, which sends each
+        # step back to the actor. Steps from cancelled fades are recognized by
+        # their generation number and ignored.
+        self._fader: VolumeFader | None = None
+        self._fade_generation = 0
+
+        self._observer: AlsaMixerObserver | SharedObserver | None = None
+
+        # False while the observer has lost the device. Until it comes back,
+        # we answer with the last known volume and mute state without
+        # touching ALSA.
+        self._connected = True
+        self._offline_volume: Percentage | None = None
+        self._offline_mute: bool | None = None
+
+        # Number of writes skipped because the hardware already had the
+        # requested value, according to the cached state.
+        self.elided_writes = 0
+
+        self._metrics_logger: MetricsLogger | None = None
+
+        # Volume and mute as last reported, readable from any thread without
+        # going through the actor's mailbox. See get_state_publisher().
+        self.state = StatePublisher()
+        self._scheduler: Scheduler | None = None
+        self._recorder: EventRecorder | None = None
 
         self._last_volume = None
         self._last_mute = None
 
+        self._log_controls()
+
+    def _open_discovery_cache(self) -> DiscoveryCache | None:
+        if not self.config["alsamixer"]["discovery_cache"]:
+            return None
+        from mopidy_alsamixer import Extension  # noqa: PLC0415
+
+        return DiscoveryCache(
+            Extension.get_cache_dir(cast("Config", self.config)) / "discovery.json"
+        )
+
+    def _make_write_executor(self) -> "concurrent.futures.ThreadPoolExecutor | None":
+        # Writes to linked controls are done in parallel, so that a write
+        # takes about as long as the slowest device.
+        if not self.linked_controls:
+            return None
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        return ThreadPoolExecutor(
+            max_workers=len(self._mixer_handles),
+            thread_name_prefix="AlsaMixerWriter",
+        )
+
+    def _log_controls(self) -> None:
         logger.info(
             f"Mixing using ALSA, {self.device_title}, mixer control {self.control!r}."
         )
+        for linked in self.linked_controls:
+            logger.info(
+                f"Linked with ALSA device {linked.device!r}, "
+                f"mixer control {linked.control!r}, offset {linked.offset:+d}."
+            )
+
+    def _probe_control(self) -> None:
+        devices = (
+            [f"hw:{index:d}" for index in self.backend.card_indexes()]
+            if self.device == AUTO
+            else [self.device]
+        )
+        controls = [] if self.control == AUTO else [self.control]
+        result = probe(self.backend, devices, controls)
+        if result is None:
+            msg = (
+                "Could not find any ALSA mixer control with playback volume "
+                f"on {', '.join(devices) or 'any soundcard'}"
+            )
+            raise exceptions.MixerError(msg)
+
+        if self.device == AUTO:
+            self.device = result.device
+            self.device_title = f"device {self.device!r}"
+        self.control = result.control
+        logger.info(
+            f"Auto-selected ALSA {self.device_title}, mixer control {self.control!r}."
+        )
+
+    def _check_controls(self) -> None:
+        # Validate that all configured controls exist. With the discovery
+        # cache enabled, we only enumerate the controls of a device if the
+        # control isn't in the cache already.
+        cache_hit = True
+        for device, device_title, control in [
+            (self.device, self.device_title, self.control),
+            *(
+                (linked.device, f"device {linked.device!r}", linked.control)
+                for linked in self.linked_controls
+            ),
+        ]:
+            if self._discovery is not None:
+                known_controls = self._discovery.get_controls(device)
+                if known_controls is not None and control in known_controls:
+                    continue
+            cache_hit = False
+            known_controls = _check_control(self.backend, device, device_title, control)
+            if self._discovery is not None:
+                self._discovery.set_controls(device, known_controls)
+
+        if self._discovery is not None:
+            self._discovery.save()
+            logger.info(
+                f"ALSA control discovery cache {'hit' if cache_hit else 'miss'}."
+            )
 
     @override
     def on_start(self) -> None:
-        self._observer = AlsaMixerObserver(
+        self._recorder = self._start_recorder()
+        proxy = self.actor_ref.proxy()
+        shared_state = self.config["alsamixer"]["shared_state"]
+        if shared_state:
+            from mopidy_alsamixer.shared import SharedObserver  # noqa: PLC0415
+
+            self._observer = SharedObserver(
+                pathlib.Path(shared_state),
+                make_observer=self._make_observer,
+                callback=proxy.trigger_events_for_changed_values,
+                publish=self.publish_observed_state,
+                connection_callback=proxy.set_device_connected,
+                raw_volume=self._raw_volume,
+            )
+        else:
+            self._observer = self._make_observer(
+                self.publish_observed_state, proxy.set_device_connected
+            )
+        self._observer.start()
+        self._publish_current()
+        interval = cast("int", self.config["alsamixer"]["metrics_log_interval"])
+        if self.metrics.enabled and interval > 0:
+            self._metrics_logger = MetricsLogger(
+                stats=self.get_stats, interval=interval
+            )
+            self._metrics_logger.start()
+
+    def _make_observer(
+        self,
+        publish: Callable[[MixerState], None],
+        connection_callback: Callable[[bool], None],
+    ) -> "AlsaMixerObserver":
+        return AlsaMixerObserver(
+            backend=self.backend,
             device=self.device,
             control=self.control,
+            linked=[(linked.device, linked.control) for linked in self.linked_controls],
             callback=self.actor_ref.proxy().trigger_events_for_changed_values,
+            coalesce_window=self.coalesce_window / 1000.0,
+            raw_volume=self._raw_volume,
+            metrics=self.metrics,
+            recorder=self._recorder,
+            connection_callback=connection_callback,
+            linked_connection_callback=self.actor_ref.proxy().set_linked_connected,
+            publish=publish,
         )
-        self._observer.start()
 
-    @property
-    def _mixer(self) -> alsaaudio.Mixer:
-        # The mixer must be recreated every time it is used to be able to
-        # observe volume/mute changes done by other applications.
-        return alsaaudio.Mixer(
+    @override
+    def on_stop(self) -> None:
+        if self._metrics_logger is not None:
+            self._metrics_logger.stop()
+            self._metrics_logger = None
+        self._cancel_fade()
+        if self._write_timer is not None:
+            self._write_timer.cancel()
+            self.flush_pending_volume()
+        if self._reactor is not None:
+            self._reactor = None
+            release_shared_reactor()
+        if self._scheduler is not None:
+            self._scheduler.close()
+            self._scheduler = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.close()
+            self._observer = None
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+        for index in range(len(self._mixer_handles)):
+            self._close_mixer(index)
+        if self._write_executor is not None:
+            self._write_executor.shutdown()
+
+    def _start_recorder(self) -> "EventRecorder | None":
+        path = self.config["alsamixer"]["record_events"]
+        if not path:
+            return None
+        from mopidy_alsamixer.replay import (  # noqa: PLC0415
+            EventRecorder,
+            RecordingHeader,
+        )
+
+        # The ranges are needed to replay the recording on a simulated control
+        ranges: list[tuple[int, int] | None] = []
+        for get_range in (self._mixer.volume_range, self._mixer.db_range):
+            try:
+                ranges.append(get_range())
+            except BackendError:
+                ranges.append(None)
+        header = RecordingHeader(
             device=self.device,
             control=self.control,
+            raw=self._raw_volume,
+            raw_range=ranges[0],
+            db_range=ranges[1],
         )
+        try:
+            recorder = EventRecorder(pathlib.Path(path), header)
+        except OSError as exc:
+            logger.warning(f"Recording ALSA mixer events failed: {exc}")
+            return None
+        logger.info(f"Recording ALSA mixer events to {path}")
+        return recorder
+
+    @property
+    def _mixer(self) -> MixerHandle:
+        return self._get_mixer(0)
+
+    def _get_mixer(self, index: int) -> MixerHandle:
+        # The mixer is kept open between calls. To observe volume/mute changes
+        # done by other applications, pending events must be handled before
+        # reading from it. If that fails, e.g. because the device is gone, we
+        # fall back to opening a new mixer.
+        handle = self._mixer_handles[index]
+        if handle is not None:
+            try:
+                handle.drain_events()
+            except BackendError as exc:
+                logger.debug(f"Reopening ALSA mixer after error: {exc}")
+                self.metrics.increment("errors")
+                self._close_mixer(index)
+                if index == 0:
+                    self._cached_state = None
+            else:
+                return handle
+
+        if index == 0:
+            device, control = self.device, self.control
+        else:
+            linked = self.linked_controls[index - 1]
+            device, control = linked.device, linked.control
+        try:
+            handle = self.backend.open(device, control)
+        except BackendError:
+            self.metrics.increment("errors")
+            # The sound cards may have changed without changing the fingerprint
+            if self._discovery is not None:
+                self._discovery.invalidate()
+            raise
+        self.metrics.increment("device_opens")
+        self._mixer_handles[index] = handle
+        return handle
+
+    def _close_mixer(self, index: int) -> None:
+        handle = self._mixer_handles[index]
+        if handle is None:
+            return
+        try:
+            handle.close()
+        except BackendError as exc:
+            logger.debug(f"Closing ALSA mixer failed: {exc}")
+        self._mixer_handles[index] = None
+
+    def _write_all(
+        self, write: Callable[[MixerHandle, LinkedControl | None], None]
+    ) -> None:
+        # Calls write(mixer, linked) for our own control, with linked set to
+        # None, and all linked controls that are not lost. Raises the first
+        # error after all writes are done.
+        if self._write_executor is None:
+            write(self._mixer, None)
+            return
+        indexes = [
+            0,
+            *(
+                index + 1
+                for index in range(len(self.linked_controls))
+                if index not in self._lost_linked
+            ),
+        ]
+        mixers = [self._get_mixer(index) for index in indexes]
+        futures = [
+            self._write_executor.submit(
+                write, handle, self.linked_controls[index - 1] if index else None
+            )
+            for index, handle in zip(indexes, mixers, strict=True)
+        ]
+        for future in futures:
+            future.result()
+
+    def _update_cached_state(self, state: MixerState | None) -> None:
+        if self.cache_state:
+            self._cached_state = state
+
+    def _refresh_cached_state(self) -> MixerState | None:
+        state = self._mixer.read_state(raw=self._raw_volume)
+        self._update_cached_state(state)
+        return state
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return counters and latency histograms of the mixer.
+
+        Apart from ``elided_writes`` and ``suppressed_events``, these are only
+        collected if the ``metrics`` config value is enabled.
+        """
+        stats = self.metrics.snapshot()
+        stats["counters"]["elided_writes"] = self.elided_writes
+        if self._observer is not None:
+            stats["counters"]["suppressed_events"] = self._observer.suppressed_events
+        return stats
+
+    def is_observing(self) -> bool:
+        """Return whether changes made by other applications are watched."""
+        return self._observer is not None and self._observer.running
+
+    def get_state_publisher(self) -> StatePublisher:
+        """Return the object holding the mixer's published state.
+
+        Its ``current`` attribute is a :class:`PublishedState` that can be
+        read from any thread at any time, without a round trip through the
+        actor, which may be busy with slow writes.
+        """
+        return self.state
+
+    def _publish_current(self) -> None:
+        try:
+            self.state.publish(self.get_volume(), self.get_mute())
+        except BackendError as exc:
+            logger.debug(f"Getting volume failed: {exc}")
+
+    def publish_observed_state(self, state: MixerState) -> None:
+        # Called on the reactor thread, ahead of the observed state reaching
+        # the actor. While one of our own writes or fades is in progress, the
+        # observed volume may be outdated, so we leave it to the actor. The
+        # check races with the actor, but the actor publishes again when it
+        # handles the state.
+        if self._pending_volume is not None or self._fader is not None:
+            return
+        self.state.publish(
+            self._volume_from_channels(state.volumes),
+            self._mute_from_channels(state.mutes) if state.mutes is not None else None,
+        )
+
+    def set_device_connected(self, connected: bool) -> None:  # noqa: FBT001
+        """Called by the observer when the device goes away or comes back."""
+        if connected == self._connected:
+            return
+        self._connected = connected
+        if connected:
+            logger.info(f"ALSA {self.device_title} is back, resynchronizing.")
+            self._cached_state = None
+            return
+
+        logger.warning(f"ALSA {self.device_title} is gone, waiting for it.")
+        state = self._cached_state
+        if state is not None:
+            self._offline_volume = self._volume_from_channels(state.volumes)
+            self._offline_mute = (
+                self._mute_from_channels(state.mutes)
+                if state.mutes is not None
+                else None
+            )
+        else:
+            self._offline_volume, self._offline_mute = (
+                self._last_volume,
+                self._last_mute,
+            )
+        self._cancel_fade()
+        if self._write_timer is not None:
+            self._write_timer.cancel()
+            self._write_timer = None
+        self._pending_volume = None
+        for index in range(len(self._mixer_handles)):
+            self._close_mixer(index)
+
+    def set_linked_connected(self, index: int, connected: bool) -> None:  # noqa: FBT001
+        """Called by the observer when a linked control goes away or comes back.
+
+        ``index`` is the control's index in :attr:`linked_controls`. While it
+        is gone, volume and mute changes are only written to the others.
+        """
+        if connected != (index in self._lost_linked):
+            return
+        linked = self.linked_controls[index]
+        if not connected:
+            logger.warning(
+                f"Linked ALSA mixer control {linked.control!r} on "
+                f"{linked.device!r} is gone, waiting for it."
+            )
+            self._lost_linked.add(index)
+            self._close_mixer(index + 1)
+            return
+
+        logger.info(
+            f"Linked ALSA mixer control {linked.control!r} on "
+            f"{linked.device!r} is back, resynchronizing."
+        )
+        self._lost_linked.discard(index)
+        if not self._connected:
+            return
+        try:
+            volume, mute = self.get_volume(), self.get_mute()
+            handle = self._get_mixer(index + 1)
+            if volume is not None:
+                handle.write_volume(self._linked_volume(volume, linked))
+            if mute is not None:
+                handle.write_mute(mute)
+        except BackendError as exc:
+            self.metrics.increment("errors")
+            logger.debug(f"Resynchronizing linked ALSA mixer failed: {exc}")
 
     @override
+    @timed("get_volume")
     def get_volume(self) -> Percentage | None:
-        channels = self._mixer.getvolume()
+        if not self._connected:
+            return self._offline_volume
+        state = self._cached_state
+        if state is None and self.cache_state:
+            state = self._refresh_cached_state()
+        if state is not None:
+            return self._volume_from_channels(state.volumes)
+        return self._volume_from_channels(
+            self._mixer.read_volumes(raw=self._raw_volume)
+        )
+
+    def _volume_from_channels(self, channels: Sequence[int]) -> Percentage | None:
         if not channels:
             return None
+        if self._channel_volumes is not None and len(channels) == len(
+            self._channel_offsets
+        ):
+            return self._balanced_volume(channels)
         if channels.count(channels[0]) == len(channels):
-            return self.mixer_volume_to_volume(channels[0])
+            return self.mixer_volume_to_volume(Percentage(channels[0]))
         # Not all channels have the same volume
         return None
 
     @override
+    @timed("set_volume")
     def set_volume(self, volume: Percentage) -> bool:
-        self._mixer.setvolume(self.volume_to_mixer_volume(volume))
+        if not self._connected:
+            return False
+        self._cancel_fade()
+        if self.ramp_threshold > 0 and self.ramp_time > 0:
+            current_volume = self.get_volume()
+            if (
+                current_volume is not None
+                and abs(volume - current_volume) > self.ramp_threshold
+            ):
+                return self.fade_volume(volume, self.ramp_time)
+        return self._request_volume(volume)
+
+    def fade_volume(self, volume: Percentage, duration: int) -> bool:
+        """Fade from the current volume to ``volume`` over ``duration`` ms."""
+        if not self._connected:
+            return False
+        self._cancel_fade()
+        current_volume = self.get_volume()
+        steps = min(
+            abs(volume - current_volume) if current_volume is not None else 0,
+            round(duration / 1000 / FADE_STEP_INTERVAL),
+        )
+        if current_volume is None or steps <= 1:
+            return self._request_volume(volume)
+
+        volumes = [
+            Percentage(round(current_volume + (volume - current_volume) * step / steps))
+            for step in range(1, steps + 1)
+        ]
+        self._fade_generation += 1
+        self._fader = VolumeFader(
+            volumes=volumes,
+            interval=duration / 1000 / steps,
+            callback=functools.partial(self._request_fade_step, self._fade_generation),
+            reactor=self._get_reactor(),
+        )
+        self._fader.start()
         return True
 
-    def mixer_volume_to_volume(self, mixer_volume: Percentage) -> Percentage:
+    def _request_fade_step(
+        self, generation: int, volume: Percentage, *, last: bool = False
+    ) -> None:
+        # Called on the reactor thread, possibly after the actor has stopped
+        with contextlib.suppress(pykka.ActorDeadError):
+            self.actor_ref.proxy().apply_fade_step(generation, volume, last=last)
+
+    def apply_fade_step(
+        self, generation: int, volume: Percentage, *, last: bool = False
+    ) -> None:
+        if generation != self._fade_generation:
+            # The fade was cancelled after the step was sent
+            return
+        if last:
+            self._fader = None
+        try:
+            self._request_volume(volume)
+        except BackendError as exc:
+            logger.warning(f"Setting volume failed: {exc}")
+            self._cancel_fade()
+
+    def schedule(
+        self,
+        when: float,
+        *,
+        volume: Percentage | None = None,
+        mute: bool | None = None,
+        interval: float | None = None,
+        fade: int = 0,
+    ) -> "ScheduledAction":
+        """Change the volume and/or mute state at ``when``.
+
+        ``when`` is in seconds since the epoch. If ``interval`` is given, the
+        action is repeated every ``interval`` seconds until cancelled. Volume
+        changes are faded over ``fade`` milliseconds.
+        """
+        if self._scheduler is None:
+            from mopidy_alsamixer.scheduler import Scheduler  # noqa: PLC0415
+
+            self._scheduler = Scheduler(run=self.actor_ref.proxy().run_scheduled_action)
+        action = self._scheduler.schedule(
+            when, volume=volume, mute=mute, interval=interval, fade=fade
+        )
+        logger.debug(f"Scheduled ALSA mixer action: {action}")
+        return action
+
+    def get_scheduled(self) -> "list[ScheduledAction]":
+        """Return the pending scheduled actions, in the order they will run."""
+        if self._scheduler is None:
+            return []
+        return self._scheduler.pending()
+
+    def cancel_scheduled(self, action_id: int) -> bool:
+        """Cancel a scheduled action, returning whether it was pending."""
+        if self._scheduler is None:
+            return False
+        return self._scheduler.cancel(action_id)
+
+    def run_scheduled_action(self, action: "ScheduledAction") -> None:
+        if action.volume is not None:
+            try:
+                if action.fade > 0:
+                    success = self.fade_volume(action.volume, action.fade)
+                else:
+                    success = self.set_volume(action.volume)
+            except BackendError as exc:
+                logger.debug(f"Setting volume failed: {exc}")
+                success = False
+            if not success:
+                logger.warning(f"Scheduled volume change {action.id} failed.")
+        if action.mute is not None and not self.set_mute(action.mute):
+            logger.warning(f"Scheduled mute change {action.id} failed.")
+
+    def _cancel_fade(self) -> None:
+        if self._fader is None:
+            return
+        self._fader.cancel()
+        self._fader = None
+        self._fade_generation += 1
+
+    def _request_volume(self, volume: Percentage) -> bool:
+        accepted = self._queue_volume(volume)
+        if accepted:
+            self.state.publish_volume(
+                self.mixer_volume_to_volume(self.volume_to_mixer_volume(volume))
+            )
+        return accepted
+
+    def _queue_volume(self, volume: Percentage) -> bool:
+        if self._write_timer is None and self._is_current_volume(volume):
+            self.elided_writes += 1
+            return True
+        self._pending_volume = volume
+        if self._write_timer is not None:
+            # The scheduled write will pick up the new volume
+            self._cache_volume(volume)
+            return True
+        delay = self._next_write_time - time.monotonic()
+        if delay <= 0:
+            return self._write_pending_volume()
+        self._cache_volume(volume)
+        self._write_timer = self._get_reactor().call_later(delay, self._request_flush)
+        return True
+
+    def _get_reactor(self) -> Reactor:
+        if self._reactor is None:
+            self._reactor = acquire_shared_reactor()
+        return self._reactor
+
+    def flush_pending_volume(self) -> None:
+        self._write_timer = None
+        if self._pending_volume is None:
+            return
+        try:
+            self._write_pending_volume()
+        except BackendError as exc:
+            logger.warning(f"Setting volume failed: {exc}")
+
+    def _request_flush(self) -> None:
+        # Called from the timer thread
+        with contextlib.suppress(pykka.ActorDeadError):
+            self.actor_ref.proxy().flush_pending_volume()
+
+    def _write_pending_volume(self) -> bool:
+        if self._pending_volume is None:
+            return True
+        volume = _clamp_percentage(self._pending_volume)
+        mixer_volume = self._mixer_volumes[volume]
+        self._pending_volume = None
+
+        def write(handle: MixerHandle, linked: LinkedControl | None) -> None:
+            if linked is None and self._channel_volumes is not None:
+                # All channels of our control are set in one batch
+                handle.write_volumes(
+                    self._channel_volumes[volume], raw=self._raw_volume
+                )
+            elif linked is None:
+                handle.write_volume(mixer_volume, raw=self._raw_volume)
+            else:
+                handle.write_volume(self._linked_volume(volume, linked))
+
+        try:
+            self._write_all(write)
+        except BackendError:
+            self.metrics.increment("errors")
+            self._cached_state = None
+            raise
+        if self.max_write_rate > 0:
+            self._next_write_time = time.monotonic() + 1.0 / self.max_write_rate
+        self._cache_volume(volume)
+        return True
+
+    def _linked_volume(self, volume: Percentage, linked: LinkedControl) -> Percentage:
+        return _clamp_percentage(self._linked_volumes[volume] + linked.offset)
+
+    def _is_current_volume(self, volume: Percentage) -> bool:
+        # Only valid while no write is pending, as pending volumes are cached
+        # before they are written.
+        state = self._cached_state
+        return (
+            self._can_elide_writes()
+            and state is not None
+            and bool(state.volumes)
+            and state.volumes == self._channel_targets(volume, len(state.volumes))
+        )
+
+    def _can_elide_writes(self) -> bool:
+        # Only our own control is cached. Linked controls may have been
+        # changed by others or missed a write, and repeating a change is
+        # what brings them back in line.
+        return not self.linked_controls
+
+    def _cache_volume(self, volume: Percentage) -> None:
+        if (state := self._cached_state) is not None:
+            self._cached_state = MixerState(
+                volumes=self._channel_targets(volume, len(state.volumes)),
+                mutes=state.mutes,
+            )
+
+    def _channel_targets(self, volume: Percentage, channels: int) -> tuple[int, ...]:
+        # Mixer volumes of all channels of our control for a volume
+        volume = _clamp_percentage(volume)
+        if self._channel_volumes is not None:
+            return self._channel_volumes[volume]
+        return (self._mixer_volumes[volume],) * channels
+
+    def mixer_volume_to_volume(self, mixer_volume: int) -> Percentage:
+        if not self._raw_volume:
+            return self._volumes[_clamp_percentage(mixer_volume)]
+        # With native units, map to the volume with the closest native value.
+        # This is exact for values we have written ourselves.
+        index = bisect.bisect_left(self._mixer_volumes, mixer_volume)
+        if index == len(self._mixer_volumes) or (
+            index > 0
+            and mixer_volume - self._mixer_volumes[index - 1]
+            < self._mixer_volumes[index] - mixer_volume
+        ):
+            index -= 1
+        return Percentage(index)
+
+    def volume_to_mixer_volume(self, volume: Percentage) -> int:
+        return self._mixer_volumes[_clamp_percentage(volume)]
+
+    def _balanced_volume(self, channels: Sequence[int]) -> Percentage:
+        # Values we have written ourselves are found in the table. Otherwise,
+        # the volume is derived from the loudest channel, so that it is what
+        # set_volume() would need to restore the channels.
+        volume = self._channel_volume_index.get(tuple(channels))
+        if volume is not None:
+            return volume
+        offset = max(self._channel_offsets)
+        channel = self._channel_offsets.index(offset)
+        return _clamp_percentage(
+            self.mixer_volume_to_volume(channels[channel]) - offset
+        )
+
+    def get_channel_offsets(self) -> list[int]:
+        return list(self.channel_offsets)
+
+    def set_channel_offsets(self, offsets: Sequence[int]) -> bool:
+        """Offset the volume of each channel from the master volume.
+
+        ``offsets`` are added to the volume of the channels, in channel
+        order, e.g. ``[0, -10]`` to make the right channel quieter. Missing
+        channels have no offset. The current volume is rewritten with the new
+        offsets.
+        """
+        if not self._connected:
+            return False
+        try:
+            volume = self.get_volume()
+        except BackendError as exc:
+            logger.debug(f"Getting volume failed: {exc}")
+            return False
+        try:
+            channel_offsets = _parse_channel_offsets(offsets)
+            tables = self._make_channel_tables(channel_offsets)
+        except exceptions.MixerError as exc:
+            logger.warning(str(exc))
+            return False
+        self.channel_offsets = channel_offsets
+        (
+            self._channel_offsets,
+            self._channel_volumes,
+            self._channel_volume_index,
+        ) = tables
+        if volume is None:
+            return True
+        return self.set_volume(volume)
+
+    def _build_volume_tables(self) -> None:
+        # The conversions are only ever done for integer percentages, so we
+        # compute them once for the whole 0-100 range and use lookups
+        # afterwards, instead of calling out to math on every get/set.
+        if self.volume_scale in ("raw", "db"):
+            self._build_native_volume_tables()
+            self._build_channel_tables()
+            return
+
+        self._mixer_volumes = tuple(
+            self._compute_mixer_volume(Percentage(volume)) for volume in range(101)
+        )
+        self._volumes = tuple(
+            self._compute_volume(Percentage(mixer_volume))
+            for mixer_volume in range(101)
+        )
+
+        round_trip = [
+            self._volumes[mixer_volume] for mixer_volume in self._mixer_volumes
+        ]
+        if not all(
+            _is_monotonic(table)
+            for table in (self._mixer_volumes, self._volumes, round_trip)
+        ):
+            logger.warning(
+                "ALSA mixer volume mapping is not monotonic with "
+                f"min_volume={self.min_volume}, max_volume={self.max_volume} "
+                f"and volume_scale={self.volume_scale}. "
+                "Volume changes may be reported out of order."
+            )
+        # Linked controls are always written as percentages
+        self._linked_volumes = self._mixer_volumes
+        self._build_channel_tables()
+
+    def _build_channel_tables(self) -> None:
+        self._channel_offsets: tuple[int, ...]
+        self._channel_volumes: tuple[tuple[int, ...], ...] | None
+        self._channel_volume_index: dict[tuple[int, ...], Percentage]
+        (
+            self._channel_offsets,
+            self._channel_volumes,
+            self._channel_volume_index,
+        ) = self._make_channel_tables(self.channel_offsets)
+
+    def _make_channel_tables(self, offsets: Sequence[int]) -> ChannelTables:
+        # With channel offsets, every volume maps to a row of mixer volumes,
+        # one per channel of our control, and rows map back to the volume.
+        if not any(offsets):
+            return (), None, {}
+        try:
+            channels = len(self._mixer.read_volumes(raw=self._raw_volume))
+        except BackendError as exc:
+            msg = f"Could not get channels of ALSA mixer control {self.control}"
+            raise exceptions.MixerError(msg) from exc
+        if not channels:
+            return (), None, {}
+        channel_offsets = tuple([*offsets, *[0] * channels][:channels])
+        channel_volumes = tuple(
+            tuple(
+                self._mixer_volumes[_clamp_percentage(volume + offset)]
+                for offset in channel_offsets
+            )
+            for volume in range(101)
+        )
+        index: dict[tuple[int, ...], Percentage] = {}
+        for volume, row in enumerate(channel_volumes):
+            index.setdefault(row, Percentage(volume))
+        return channel_offsets, channel_volumes, index
+
+    def _build_native_volume_tables(self) -> None:
+        # Read and write the control in its own raw units, so that values we
+        # write are read back exactly. The ranges are only queried once.
+        self._raw_volume = True
+        try:
+            raw_min, raw_max = self._mixer.volume_range()
+        except BackendError as exc:
+            msg = f"Could not get volume range of ALSA mixer control {self.control}"
+            raise exceptions.MixerError(msg) from exc
+        db_range: tuple[int, int] | None = None
+        if self.volume_scale == "db":
+            try:
+                db_range = self._mixer.db_range()
+            except BackendError as exc:
+                logger.warning(
+                    f"ALSA mixer control {self.control} has no dB range, "
+                    f"using raw volume scale instead: {exc}"
+                )
+        if db_range is not None and db_range[0] == DB_GAIN_MUTE:
+            # The real dB value of the lowest audible step is unknown, and
+            # mapping over the mute gain would make every volume near full.
+            logger.warning(
+                f"ALSA mixer control {self.control} only reports its dB "
+                "minimum as mute, using raw volume scale instead"
+            )
+            db_range = None
+
+        fractions = [
+            _db_fraction(
+                (self.min_volume + volume * (self.max_volume - self.min_volume) / 100.0)
+                / 100.0,
+                db_range,
+            )
+            for volume in range(101)
+        ]
+        self._mixer_volumes = tuple(
+            raw_min + round(fraction * (raw_max - raw_min)) for fraction in fractions
+        )
+        self._linked_volumes = tuple(
+            _clamp_percentage(round(fraction * 100)) for fraction in fractions
+        )
+
+        if not _is_monotonic(self._mixer_volumes):
+            logger.warning(
+                "ALSA mixer volume mapping is not monotonic with "
+                f"min_volume={self.min_volume}, max_volume={self.max_volume} "
+                f"and volume_scale={self.volume_scale}. "
+                "Volume changes may be reported out of order."
+            )
+        elif len(set(self._mixer_volumes)) < len(self._mixer_volumes):
+            logger.info(
+                f"ALSA mixer control {self.control} has fewer volume steps than "
+                "Mopidy, some volume changes will have no effect."
+            )
+
+    def _compute_volume(self, mixer_volume: Percentage) -> Percentage:
         match self.volume_scale:
             case "cubic":
-                return Percentage(
-                    int(
-                        GstAudio.StreamVolume.convert_volume(
-                            GstAudio.StreamVolumeFormat.CUBIC,
-                            GstAudio.StreamVolumeFormat.LINEAR,
-                            mixer_volume / 100.0,
-                        )
-                        * 100.0
-                    )
-                )
+                # Same as GstAudio.StreamVolume.convert_volume(
+                # GstAudio.StreamVolumeFormat.CUBIC,
+                # GstAudio.StreamVolumeFormat.LINEAR, mixer_volume / 100.0),
+                # without having to load GStreamer.
+                cubic_volume = mixer_volume / 100.0
+                linear_volume = cubic_volume * cubic_volume * cubic_volume * 100.0
             case "log":
                 # Uses our own formula rather than GstAudio.StreamVolume.
                 # convert_volume(GstAudio.StreamVolumeFormat.LINEAR,
                 # GstAudio.StreamVolumeFormat.DB, mixer_volume / 100.0)
                 # as the result is a DB value, which we can't work with as
                 # self._mixer provides a percentage.
-                return Percentage(int(math.pow(10, mixer_volume / 50.0)))
-            case "linear":
-                return Percentage(
-                    int(
-                        (mixer_volume - self.min_volume)
-                        * 100.0
-                        / (self.max_volume - self.min_volume)
-                    )
+                linear_volume = (
+                    math.pow(10, mixer_volume / 50.0) if mixer_volume > 0 else 0.0
                 )
+            case "linear" | "raw" | "db":
+                # Native scales use _build_native_volume_tables() instead
+                linear_volume = float(mixer_volume)
 
-    def volume_to_mixer_volume(self, volume: Percentage) -> Percentage:
+        if self.max_volume == self.min_volume:
+            return Percentage(100 if linear_volume >= self.max_volume else 0)
+        volume = int(
+            (linear_volume - self.min_volume)
+            * 100.0
+            / (self.max_volume - self.min_volume)
+        )
+        return _clamp_percentage(volume)
+
+    def _compute_mixer_volume(self, volume: Percentage) -> Percentage:
         mixer_volume = int(
             self.min_volume + volume * (self.max_volume - self.min_volume) / 100.0
         )
         match self.volume_scale:
             case "cubic":
-                return Percentage(
-                    int(
-                        GstAudio.StreamVolume.convert_volume(
-                            GstAudio.StreamVolumeFormat.LINEAR,
-                            GstAudio.StreamVolumeFormat.CUBIC,
-                            mixer_volume / 100.0,
-                        )
-                        * 100.0
-                    )
-                )
+                # Same as GstAudio.StreamVolume.convert_volume(
+                # GstAudio.StreamVolumeFormat.LINEAR,
+                # GstAudio.StreamVolumeFormat.CUBIC, mixer_volume / 100.0),
+                # without having to load GStreamer.
+                return Percentage(int(math.pow(mixer_volume / 100.0, 1 / 3.0) * 100.0))
             case "log":
                 # Uses our own formula rather than GstAudio.StreamVolume.
                 # convert_volume(GstAudio.StreamVolumeFormat.LINEAR,
                 # GstAudio.StreamVolumeFormat.DB, mixer_volume / 100.0)
                 # as the result is a DB value, which we can't work with as
                 # self._mixer wants a percentage.
+                if mixer_volume < 1:
+                    return Percentage(0)
                 return Percentage(int(50 * math.log10(mixer_volume)))
-            case "linear":
+            case "linear" | "raw" | "db":
                 return Percentage(mixer_volume)
 
     @override
+    @timed("get_mute")
     def get_mute(self) -> bool | None:
+        if not self._connected:
+            return self._offline_mute
+        state = self._cached_state
+        if state is None and self.cache_state:
+            state = self._refresh_cached_state()
+        if state is not None:
+            if state.mutes is None:
+                return None
+            return self._mute_from_channels(state.mutes)
         try:
-            channels_muted = self._mixer.getmute()
-        except alsaaudio.ALSAAudioError as exc:
+            channels_muted = self._mixer.read_mutes()
+        except BackendError as exc:
+            self.metrics.increment("errors")
             logger.debug(f"Getting mute state failed: {exc}")
             return None
+        return self._mute_from_channels(channels_muted)
+
+    def _mute_from_channels(self, channels_muted: Sequence[int]) -> bool | None:
         if all(channels_muted):
             return True
         if not any(channels_muted):
@@ -170,63 +1106,579 @@ class AlsaMixer(pykka.ThreadingActor, mixer.Mixer):
         return None
 
     @override
+    @timed("set_mute")
     def set_mute(self, mute: bool) -> bool:
+        if not self._connected:
+            return False
+        state = self._cached_state
+        if (
+            self._can_elide_writes()
+            and state is not None
+            and state.mutes
+            and all(channel == int(mute) for channel in state.mutes)
+        ):
+            self.elided_writes += 1
+            return True
         try:
-            self._mixer.setmute(int(mute))
-        except alsaaudio.ALSAAudioError as exc:
+            self._write_all(lambda handle, _: handle.write_mute(mute))
+        except BackendError as exc:
+            self.metrics.increment("errors")
             logger.debug(f"Setting mute state failed: {exc}")
             return False
+        if (state := self._cached_state) is not None and state.mutes is not None:
+            self._cached_state = MixerState(
+                volumes=state.volumes, mutes=(int(mute),) * len(state.mutes)
+            )
+        self.state.publish_mute(mute)
+        return True
+
+    @timed("trigger_events")
+    def trigger_events_for_changed_values(
+        self, state: MixerState | None = None
+    ) -> None:
+        if state is None:
+            # Something changed, but we don't know what. Bypass the cache.
+            self._cached_state = None
+            volume, mute = self.get_volume(), self.get_mute()
         else:
-            return True
+            self._update_cached_state(state)
+            volume = self._volume_from_channels(state.volumes)
+            mute = (
+                self._mute_from_channels(state.mutes)
+                if state.mutes is not None
+                else None
+            )
+
+        if self._pending_volume is not None:
+            # The observed volume is already outdated by a pending write. Keep
+            # the pending volume in the cache and don't tell anyone.
+            self._cache_volume(self._pending_volume)
+            volume = self._last_volume
+            self.state.publish_mute(mute)
+        elif self._fader is not None:
+            # Echo of one of our own fade steps. Only the final volume of the
+            # fade is reported.
+            volume = self._last_volume
+            self.state.publish_mute(mute)
+        else:
+            self.state.publish(volume, mute)
 
-    def trigger_events_for_changed_values(self) -> None:
-        old_volume, self._last_volume = self._last_volume, self.get_volume()
-        old_mute, self._last_mute = self._last_mute, self.get_mute()
+        old_volume, self._last_volume = self._last_volume, volume
+        old_mute, self._last_mute = self._last_mute, mute
 
         if self._last_volume is not None and self._last_volume != old_volume:
+            self.metrics.increment("volume_events")
             self.trigger_volume_changed(self._last_volume)
 
         if self._last_mute is not None and self._last_mute != old_mute:
+            self.metrics.increment("mute_events")
             self.trigger_mute_changed(self._last_mute)
 
 
-class AlsaMixerObserver(threading.Thread):
-    daemon = True
-    name = "AlsaMixerObserver"
+class VolumeFader:
+    """Calls ``callback`` with each of ``volumes``, ``interval`` seconds apart.
+
+    The steps are timed by ``reactor``, and the callback is called on its
+    thread.
+    """
 
     def __init__(
+        self,
+        volumes: Sequence[Percentage],
+        interval: float,
+        callback: Callable[..., None],
+        reactor: Reactor,
+    ) -> None:
+        self.volumes = volumes
+        self.interval = interval
+        self.callback = callback
+        self.reactor = reactor
+        self._step = 0
+        self._timer: ReactorTimer | None = None
+        self._cancelled = False
+
+    def start(self) -> None:
+        self._timer = self.reactor.call_later(self.interval, self._on_timer)
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _on_timer(self) -> None:
+        if self._cancelled:
+            return
+        volume = self.volumes[self._step]
+        self._step += 1
+        last = self._step == len(self.volumes)
+        if not last:
+            self.start()
+        self.callback(volume, last=last)
+
+
+def _db_fraction(fraction: float, db_range: tuple[int, int] | None) -> float:
+    # Maps a volume fraction to a fraction of the raw range of a control. With
+    # a dB range, this is the same cubic mapping alsamixer uses, assuming dB
+    # are linear in raw units. dB values are in hundredths of a dB.
+    if db_range is None:
+        return fraction
+    db_min, db_max = db_range
+    if db_max - db_min <= MAX_LINEAR_DB_SCALE:
+        return fraction
+    if fraction <= 0:
+        return 0.0
+    min_norm = math.pow(10, (db_min - db_max) / 6000.0)
+    db = 6000.0 * math.log10(fraction * (1 - min_norm) + min_norm) + db_max
+    return min(max((db - db_min) / (db_max - db_min), 0.0), 1.0)
+
+
+def _check_control(
+    backend: MixerBackend, device: str, device_title: str, control: str
+) -> list[str]:
+    try:
+        known_controls = backend.list_controls(device)
+    except BackendError as exc:
+        known_cards = backend.list_cards()
+        msg = (
+            f"Could not find ALSA {device_title}. "
+            "Known soundcards include: "
+            f"{', '.join(known_cards)}"
+        )
+        raise exceptions.MixerError(msg) from exc
+
+    if control not in known_controls:
+        msg = (
+            "Could not find ALSA mixer control "
+            f"{control} on {device_title}. "
+            f"Known mixers on {device_title} include: "
+            f"{', '.join(known_controls)}"
+        )
+        raise exceptions.MixerError(msg)
+
+    return known_controls
+
+
+def _parse_linked_controls(values: Sequence[str]) -> list[LinkedControl]:
+    try:
+        return [LinkedControl.parse(value) for value in values]
+    except ValueError as exc:
+        raise exceptions.MixerError(str(exc)) from exc
+
+
+def _parse_channel_offsets(values: Sequence[str | int]) -> list[int]:
+    try:
+        offsets = [int(value) for value in values]
+    except ValueError as exc:
+        msg = f"Invalid channel offsets {list(values)!r}, expected integers"
+        raise exceptions.MixerError(msg) from exc
+    if not all(-100 <= offset <= 100 for offset in offsets):  # noqa: PLR2004
+        msg = f"Channel offsets must be between -100 and 100, got {offsets}"
+        raise exceptions.MixerError(msg)
+    return offsets
+
+
+def _clamp_percentage(value: int) -> Percentage:
+    return Percentage(min(max(value, 0), 100))
+
+
+def _is_monotonic(values: Sequence[int]) -> bool:
+    return all(a <= b for a, b in itertools.pairwise(values))
+
+
+def _poll_descriptor(handle: MixerHandle) -> tuple[int, int]:
+    descriptors = handle.poll_descriptors()
+    if len(descriptors) != 1:
+        msg = "Expected exactly one poll descriptor"
+        raise AssertionError(msg)
+    return descriptors[0]
+
+
+class AlsaMixerObserver:
+    """Watches mixer controls for changes made by other applications.
+
+    The controls' descriptors are registered with a :class:`Reactor`, by
+    default the one shared by all observers, so that any number of mixers
+    are watched by a single thread.
+
+    If the control goes away, e.g. because its USB soundcard was unplugged,
+    all controls are closed and reopening them is retried with exponential
+    backoff. ``connection_callback`` is called with ``False`` when that
+    happens, and with ``True`` once the controls are back, followed by a
+    callback with their current state.
+
+    A linked control going away only closes that control, which is then
+    reopened in the background while the others keep being watched.
+    ``linked_connection_callback`` is called with its index in ``linked``
+    and ``False`` when that happens, and ``True`` once it is back.
+    """
+
+    def __init__(  # noqa: PLR0913
         self,
         device: str,
         control: str,
-        callback: Callable[[], None] | None = None,
+        callback: Callable[[MixerState | None], None] | None = None,
+        *,
+        backend: MixerBackend | None = None,
+        coalesce_window: float = 0,
+        linked: Sequence[tuple[str, str]] = (),
+        raw_volume: bool = False,
+        metrics: Metrics | None = None,
+        recorder: "EventRecorder | None" = None,
+        reactor: Reactor | None = None,
+        connection_callback: Callable[[bool], None] | None = None,
+        linked_connection_callback: Callable[[int, bool], None] | None = None,
+        publish: Callable[[MixerState], None] | None = None,
     ) -> None:
-        super().__init__()
-        self.running = True
+        self.running = False
+        self.connected = False
+        self.raw_volume = raw_volume
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
 
-        # Keep the mixer instance alive for the descriptors to work
-        self.mixer = alsaaudio.Mixer(device=device, control=control)
+        # If set, the state at every wakeup is recorded for later replay
+        self.recorder = recorder
+        self.backend = backend if backend is not None else AlsaBackend()
 
-        descriptors = self.mixer.polldescriptors()
-        if len(descriptors) != 1:
-            msg = "Expected exactly one poll descriptor"
-            raise AssertionError(msg)
-        self.fd = descriptors[0][0]
-        self.event_mask = descriptors[0][1]
+        # Changes to any of the linked controls wake us up, but the state is
+        # always read from the first one.
+        self.controls = [(device, control), *linked]
+        self._open()
 
         self.callback = callback
+        self.connection_callback = connection_callback
+        self.linked_connection_callback = linked_connection_callback
+
+        # Called on our thread with every state read, before the callback
+        self.publish = publish
+
+        # Events arriving within coalesce_window seconds after a callback are
+        # collapsed into a single callback at the end of the window.
+        self.coalesce_window = coalesce_window
+        self.suppressed_events = 0
+        self._window: ReactorTimer | None = None
+        self._pending = False
+        self._burst_events = 0
+
+        self._reconnect_timer: ReactorTimer | None = None
+        self._reconnect_delay = RECONNECT_MIN_DELAY
+
+        # Linked controls that are gone, by index, with their reconnect
+        # timers and backoff.
+        self._lost_linked: set[int] = set()
+        self._linked_timers: dict[int, ReactorTimer] = {}
+        self._linked_delays: dict[int, float] = {}
+
+        # If no reactor is given, the shared one is acquired on start()
+        self._reactor = reactor
+        self._owns_reactor = reactor is None
+        self._lock = threading.Lock()
+
+    def _open(self) -> None:
+        # Keep the mixer instances alive for the descriptors to work. Only
+        # our own control must open, linked ones that fail are retried once
+        # we are started.
+        self.mixer, descriptor = self._open_control(0)
+        self.linked_mixers: list[MixerHandle | None] = []
+        self._descriptors: list[tuple[int, int] | None] = [descriptor]
+        for index in range(1, len(self.controls)):
+            try:
+                handle, descriptor = self._open_control(index)
+            except BackendError as exc:
+                device, control = self.controls[index]
+                logger.debug(f"Opening ALSA mixer {control} on {device} failed: {exc}")
+                handle = descriptor = None
+            self.linked_mixers.append(handle)
+            self._descriptors.append(descriptor)
+        self.connected = True
+
+    def _open_control(self, index: int) -> tuple[MixerHandle, tuple[int, int]]:
+        handle = self.backend.open(*self.controls[index])
+        try:
+            descriptor = _poll_descriptor(handle)
+        except BaseException:
+            self._close_handles([handle])
+            raise
+        self.metrics.increment("device_opens")
+        return handle, descriptor
+
+    @property
+    def descriptors(self) -> list[tuple[int, int]]:
+        """The poll descriptors of the controls that are currently open."""
+        return [
+            descriptor for descriptor in self._descriptors if descriptor is not None
+        ]
+
+    def _open_handles(self) -> list[MixerHandle]:
+        return [
+            handle for handle in (self.mixer, *self.linked_mixers) if handle is not None
+        ]
+
+    def _close_handles(self, handles: Iterable[MixerHandle]) -> None:
+        for handle in handles:
+            try:
+                handle.close()
+            except BackendError as exc:
+                logger.debug(f"Closing ALSA mixer failed: {exc}")
+
+    def start(self) -> None:
+        with self._lock:
+            if self._reactor is None:
+                self._reactor = acquire_shared_reactor()
+            self.running = True
+            self._register()
+
+    def _register(self) -> None:
+        if self._reactor is None:
+            return
+        for index, descriptor in enumerate(self._descriptors):
+            if descriptor is not None:
+                self._add_descriptor(index, descriptor)
+        for index, handle in enumerate(self.linked_mixers):
+            if handle is None:
+                self._lose_linked(index)
+            elif index in self._lost_linked:
+                self._found_linked(index)
+
+    def _add_descriptor(self, index: int, descriptor: tuple[int, int]) -> None:
+        if self._reactor is not None:
+            fd, event_mask = descriptor
+            self._reactor.add(
+                fd,
+                event_mask | select.EPOLLET,
+                functools.partial(self._on_event, index),
+            )
+
+    def _unregister(self) -> None:
+        if self._reactor is None:
+            return
+        for fd, _ in self.descriptors:
+            self._reactor.remove(fd)
+        for timer in self._linked_timers.values():
+            timer.cancel()
+        self._linked_timers.clear()
+        if self._window is not None:
+            self._window.cancel()
+            self._window = None
+        self._pending = False
+        self._burst_events = 0
 
     def stop(self) -> None:
-        self.running = False
+        with self._lock:
+            if not self.running or self._reactor is None:
+                return
+            self.running = False
+            if self.connected:
+                self._unregister()
+            if self._reconnect_timer is not None:
+                self._reconnect_timer.cancel()
+                self._reconnect_timer = None
+            release = self._owns_reactor
+            if release:
+                self._reactor = None
+        # Outside of the lock, as releasing may wait for a callback of ours
+        # that is blocked on it.
+        if release:
+            release_shared_reactor()
+
+    def refresh(self) -> None:
+        """Read and deliver the current state, as if it had changed."""
+        with self._lock:
+            if self.running and self.connected:
+                self._notify()
+
+    def close(self) -> None:
+        """Release the mixers and descriptors. Call after stop()."""
+        if self.connected:
+            self._close_handles(self._open_handles())
 
-    def run(self) -> None:
-        poller = select.epoll()
-        poller.register(self.fd, self.event_mask | select.EPOLLET)
-        while self.running:
+    def _on_event(self, index: int, events: int) -> None:
+        # Called on the reactor thread whenever one of our descriptors fires
+        with self._lock:
+            if not self.running or not self.connected:
+                return
+            self.metrics.increment("wakeups")
+            if events & (select.EPOLLERR | select.EPOLLHUP):
+                if index == 0:
+                    self._disconnect("poll error")
+                else:
+                    self._drop_linked(index - 1, "poll error")
+                return
+            if self.recorder is not None:
+                self.recorder.record(self._read_state())
+                if not self.connected:
+                    return
+            if self._window is None:
+                self._notify()
+                self._open_window()
+            elif self._handle_events():
+                self._pending = True
+                self._burst_events += 1
+                self.suppressed_events += 1
+
+    def _disconnect(self, reason: str) -> None:
+        # Called with the lock held. Parks the observer until the controls
+        # can be reopened. Nothing is polled in the meantime, so an outage
+        # costs nothing but the occasional reconnect attempt.
+        logger.debug(f"Lost ALSA mixer ({reason}), reconnecting")
+        self.metrics.increment("disconnects")
+        self._unregister()
+        self._close_handles(self._open_handles())
+        self.connected = False
+        self._reconnect_delay = RECONNECT_MIN_DELAY
+        self._schedule_reconnect()
+        if self.connection_callback is not None:
+            self.connection_callback(False)  # noqa: FBT003
+
+    def _schedule_reconnect(self) -> None:
+        if self._reactor is not None:
+            self._reconnect_timer = self._reactor.call_later(
+                self._reconnect_delay, self._reconnect
+            )
+
+    def _reconnect(self) -> None:
+        with self._lock:
+            self._reconnect_timer = None
+            if not self.running:
+                return
             try:
-                events = poller.poll(timeout=1)
-                if events and self.callback is not None:
-                    self.callback()
-            except OSError as exc:
-                # poller.poll() will raise an IOError because of the
-                # interrupted system call when suspending the machine.
-                logger.debug(f"Ignored IO error: {exc}")
+                self._open()
+            except BackendError as exc:
+                self._reconnect_delay = min(
+                    self._reconnect_delay * 2, RECONNECT_MAX_DELAY
+                )
+                logger.debug(
+                    f"Reopening ALSA mixer failed, retrying in "
+                    f"{self._reconnect_delay:g}s: {exc}"
+                )
+                self._schedule_reconnect()
+                return
+            self.metrics.increment("reconnects")
+            self._register()
+            if self.connection_callback is not None:
+                self.connection_callback(True)  # noqa: FBT003
+            # Changes made while we were gone were not observed
+            self._notify()
+
+    def _drop_linked(self, index: int, reason: str) -> None:
+        # Called with the lock held. Only this control is closed, the others
+        # keep being watched and written while it is reopened.
+        handle = self.linked_mixers[index]
+        descriptor = self._descriptors[index + 1]
+        if handle is None or descriptor is None:
+            return
+        device, control = self.controls[index + 1]
+        logger.debug(f"Lost ALSA mixer {control} on {device} ({reason}), reconnecting")
+        self.metrics.increment("disconnects")
+        if self._reactor is not None:
+            self._reactor.remove(descriptor[0])
+        self._close_handles([handle])
+        self.linked_mixers[index] = None
+        self._descriptors[index + 1] = None
+        self._linked_delays[index] = RECONNECT_MIN_DELAY
+        self._lose_linked(index)
+
+    def _lose_linked(self, index: int) -> None:
+        if self._reactor is not None:
+            self._linked_timers[index] = self._reactor.call_later(
+                self._linked_delays.setdefault(index, RECONNECT_MIN_DELAY),
+                functools.partial(self._reconnect_linked, index),
+            )
+        if index not in self._lost_linked:
+            self._lost_linked.add(index)
+            if self.linked_connection_callback is not None:
+                self.linked_connection_callback(index, False)  # noqa: FBT003
+
+    def _found_linked(self, index: int) -> None:
+        self._lost_linked.discard(index)
+        self._linked_delays.pop(index, None)
+        if self.linked_connection_callback is not None:
+            self.linked_connection_callback(index, True)  # noqa: FBT003
+
+    def _reconnect_linked(self, index: int) -> None:
+        with self._lock:
+            self._linked_timers.pop(index, None)
+            if (
+                not self.running
+                or not self.connected
+                or self.linked_mixers[index] is not None
+            ):
+                return
+            try:
+                handle, descriptor = self._open_control(index + 1)
+            except BackendError as exc:
+                delay = min(self._linked_delays[index] * 2, RECONNECT_MAX_DELAY)
+                self._linked_delays[index] = delay
+                device, control = self.controls[index + 1]
+                logger.debug(
+                    f"Reopening ALSA mixer {control} on {device} failed, "
+                    f"retrying in {delay:g}s: {exc}"
+                )
+                self._lose_linked(index)
+                return
+            self.metrics.increment("reconnects")
+            self.linked_mixers[index] = handle
+            self._descriptors[index + 1] = descriptor
+            self._add_descriptor(index + 1, descriptor)
+            self._found_linked(index)
+
+    def _open_window(self) -> None:
+        if self.coalesce_window > 0 and self._reactor is not None:
+            self._window = self._reactor.call_later(
+                self.coalesce_window, self._on_window_end
+            )
+
+    def _on_window_end(self) -> None:
+        with self._lock:
+            if not self.running or not self.connected:
+                return
+            self._window = None
+            if self._pending:
+                # Deliver the final state of the burst, and keep coalescing
+                # for another window in case it continues.
+                self._notify()
+                self._pending = False
+                self._open_window()
+            elif self._burst_events:
+                logger.debug(
+                    f"Coalesced {self._burst_events} ALSA mixer events "
+                    f"({self.suppressed_events} in total)"
+                )
+                self._burst_events = 0
+
+    def _handle_events(self) -> bool:
+        # The descriptors are registered as edge-triggered, so all pending
+        # events must be handled for the next change to wake us up again. If
+        # that fails, the device is most likely gone.
+        try:
+            self.mixer.drain_events()
+        except BackendError as exc:
+            self.metrics.increment("errors")
+            self._disconnect(str(exc))
+            return False
+        for index, handle in enumerate(self.linked_mixers):
+            if handle is None:
+                continue
+            try:
+                handle.drain_events()
+            except BackendError as exc:
+                self.metrics.increment("errors")
+                self._drop_linked(index, str(exc))
+        return True
+
+    def _read_state(self) -> MixerState | None:
+        if not self._handle_events():
+            return None
+        try:
+            return self.mixer.read_state(raw=self.raw_volume)
+        except BackendError as exc:
+            logger.debug(f"Getting volume failed: {exc}")
+            self.metrics.increment("errors")
+            return None
+
+    @timed("observer_notify")
+    def _notify(self) -> None:
+        state = self._read_state()
+        if state is not None and self.publish is not None:
+            self.publish(state)
+        if self.callback is not None and self.connected:
+            # If reading the state failed, the mixer will read it itself.
+            self.callback(state)
@@ -0,0 +1,162 @@
+import heapq
+import itertools
+import logging
+import os
+import select
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ReactorTimer:
+    """A callback scheduled with :meth:`Reactor.call_later`."""
+
+    __slots__ = ("callback", "cancelled", "when")
+
+    def __init__(self, when: float, callback: Callable[[], None]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Reactor(threading.Thread):
+    """Event loop watching file descriptors for any number of mixers.
+
+    All registered descriptors share one epoll set, and all callbacks run on
+    the reactor thread. Descriptors and timers can be added and removed from
+    any thread while the reactor runs.
+    """
+
+    daemon = True
+    name = "AlsaMixerReactor"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._poller = select.epoll()
+        self._lock = threading.Lock()
+        self._callbacks: dict[int, Callable[[int], None]] = {}
+        self._timers: list[tuple[float, int, ReactorTimer]] = []
+        self._timer_ids = itertools.count()
+        self._running = True
+
+        # Written to wake up the loop for a new timer or for stopping
+        self._wakeup_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        self._poller.register(self._wakeup_fd, select.EPOLLIN)
+
+    def add(self, fd: int, event_mask: int, callback: Callable[[int], None]) -> None:
+        """Call ``callback(events)`` on the reactor thread when ``fd`` is ready."""
+        with self._lock:
+            self._callbacks[fd] = callback
+            self._poller.register(fd, event_mask)
+
+    def remove(self, fd: int) -> None:
+        with self._lock:
+            if self._callbacks.pop(fd, None) is None:
+                return
+            try:
+                self._poller.unregister(fd)
+            except OSError as exc:
+                # The descriptor may already be closed
+                logger.debug(f"Unregistering descriptor {fd} failed: {exc}")
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> ReactorTimer:
+        """Call ``callback()`` on the reactor thread after ``delay`` seconds."""
+        timer = ReactorTimer(time.monotonic() + delay, callback)
+        with self._lock:
+            heapq.heappush(self._timers, (timer.when, next(self._timer_ids), timer))
+            is_next = self._timers[0][2] is timer
+        if is_next:
+            os.eventfd_write(self._wakeup_fd, 1)
+        return timer
+
+    def stop(self) -> None:
+        self._running = False
+        os.eventfd_write(self._wakeup_fd, 1)
+
+    def close(self) -> None:
+        """Release the epoll set. Call after the thread is done."""
+        self._poller.close()
+        os.close(self._wakeup_fd)
+
+    def run(self) -> None:
+        while self._running:
+            try:
+                events = self._poller.poll(timeout=self._next_timeout())
+            except OSError as exc:
+                # poll() raises an IOError because of the interrupted system
+                # call when suspending the machine.
+                logger.debug(f"Ignored IO error: {exc}")
+                continue
+            for fd, event_mask in events:
+                if fd == self._wakeup_fd:
+                    os.eventfd_read(self._wakeup_fd)
+                    continue
+                with self._lock:
+                    callback = self._callbacks.get(fd)
+                if callback is not None:
+                    self._run_callback(callback, event_mask)
+            for timer in self._due_timers():
+                self._run_callback(timer.callback)
+
+    def _next_timeout(self) -> float | None:
+        # Without timers, we sleep until a descriptor is ready
+        with self._lock:
+            while self._timers and self._timers[0][2].cancelled:
+                heapq.heappop(self._timers)
+            if not self._timers:
+                return None
+            return max(self._timers[0][0] - time.monotonic(), 0)
+
+    def _due_timers(self) -> list[ReactorTimer]:
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._timers and self._timers[0][0] <= now:
+                _, _, timer = heapq.heappop(self._timers)
+                if not timer.cancelled:
+                    due.append(timer)
+        return due
+
+    def _run_callback(self, callback: Callable[..., None], *args: int) -> None:
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Error in ALSA mixer reactor callback")
+
+
+_shared_lock = threading.Lock()
+_shared_reactor: Reactor | None = None
+_shared_users = 0
+
+
+def acquire_shared_reactor() -> Reactor:
+    """Return the reactor shared by all observers, starting it if needed.
+
+    Each call must be paired with a call to :func:`release_shared_reactor`.
+    """
+    global _shared_reactor, _shared_users  # noqa: PLW0603
+    with _shared_lock:
+        if _shared_reactor is None:
+            _shared_reactor = Reactor()
+            _shared_reactor.start()
+        _shared_users += 1
+        return _shared_reactor
+
+
+def release_shared_reactor() -> None:
+    """Stop the shared reactor once it has no more users."""
+    global _shared_reactor, _shared_users  # noqa: PLW0603
+    with _shared_lock:
+        _shared_users -= 1
+        if _shared_users > 0 or _shared_reactor is None:
+            return
+        reactor, _shared_reactor = _shared_reactor, None
+    reactor.stop()
+    if reactor is not threading.current_thread():
+        reactor.join()
+        reactor.close()
@@ -0,0 +1,174 @@
+"""Recording and replaying of ALSA mixer event streams.
+
+A recording is a JSON lines file. The first line is a header describing the
+recorded control, and every following line is one wakeup of the observer, as
+``[seconds since start, volumes, mutes]``. Mutes are ``null`` if the control
+has no mute switch.
+"""
+
+import json
+import logging
+import pathlib
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import IO
+
+from mopidy_alsamixer.backend import MemoryBackend, MemoryControl, MixerState
+
+logger = logging.getLogger(__name__)
+
+FORMAT = "mopidy-alsamixer-events"
+VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class RecordingHeader:
+    device: str
+    control: str
+
+    # True if volumes are in raw hardware units instead of percentages
+    raw: bool
+
+    # Ranges of the recorded control, if known. dB are in hundredths of a dB.
+    raw_range: tuple[int, int] | None = None
+    db_range: tuple[int, int] | None = None
+
+
+class EventRecorder:
+    """Writes timestamped mixer state snapshots to a recording file."""
+
+    def __init__(self, path: pathlib.Path, header: RecordingHeader) -> None:
+        self.path = path
+        self._file: IO[str] = path.open("w")
+        self._start = time.monotonic()
+        self._write(
+            {
+                "format": FORMAT,
+                "version": VERSION,
+                "device": header.device,
+                "control": header.control,
+                "raw": header.raw,
+                "raw_range": header.raw_range,
+                "db_range": header.db_range,
+            }
+        )
+
+    def _write(self, data: object) -> None:
+        self._file.write(json.dumps(data, separators=(",", ":")))
+        self._file.write("\n")
+
+    def record(self, state: MixerState | None) -> None:
+        if state is None:
+            return
+        self._write(
+            [
+                round(time.monotonic() - self._start, 6),
+                state.volumes,
+                state.mutes,
+            ]
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_recording(
+    path: pathlib.Path,
+) -> tuple[RecordingHeader, list[tuple[float, MixerState]]]:
+    """Read a recording, raising :exc:`ValueError` if it is invalid."""
+    with path.open() as f:
+        lines = iter(f)
+        try:
+            header_data = json.loads(next(lines))
+        except StopIteration:
+            msg = f"{path} is empty"
+            raise ValueError(msg) from None
+        if (
+            not isinstance(header_data, dict)
+            or header_data.get("format") != FORMAT
+            or header_data.get("version") != VERSION
+        ):
+            msg = f"{path} is not a mixer event recording"
+            raise ValueError(msg)
+        header = RecordingHeader(
+            device=header_data["device"],
+            control=header_data["control"],
+            raw=header_data["raw"],
+            raw_range=_parse_range(header_data.get("raw_range")),
+            db_range=_parse_range(header_data.get("db_range")),
+        )
+        events = list(_parse_events(lines))
+    return header, events
+
+
+def _parse_range(value: list[int] | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    low, high = value
+    return (int(low), int(high))
+
+
+def _parse_events(lines: Iterator[str]) -> Iterator[tuple[float, MixerState]]:
+    for line in lines:
+        if not line.strip():
+            continue
+        timestamp, volumes, mutes = json.loads(line)
+        yield (
+            float(timestamp),
+            MixerState(
+                volumes=tuple(volumes),
+                mutes=tuple(mutes) if mutes is not None else None,
+            ),
+        )
+
+
+def make_backend(
+    header: RecordingHeader, events: list[tuple[float, MixerState]]
+) -> MemoryBackend:
+    """Return a :class:`MemoryBackend` simulating the recorded control."""
+    first = events[0][1] if events else None
+    control = MemoryControl(
+        channels=len(first.volumes) if first is not None else 2,
+        raw_range=header.raw_range or (0, 255),
+        db_range=header.db_range,
+        has_mute=first is None or first.mutes is not None,
+    )
+    return MemoryBackend({header.device: {header.control: control}})
+
+
+def replay(  # noqa: PLR0913
+    path: pathlib.Path,
+    backend: MemoryBackend,
+    *,
+    device: str | None = None,
+    control: str | None = None,
+    speed: float = 1.0,
+    stop: threading.Event | None = None,
+) -> int:
+    """Replay a recording into a control of a :class:`MemoryBackend`.
+
+    The recorded states are written to the control with the recorded timing,
+    divided by ``speed``. A ``speed`` of ``0`` replays as fast as possible.
+    By default, the recorded device and control are used. Returns the number
+    of replayed events.
+    """
+    header, events = read_recording(path)
+    handle = backend.open(device or header.device, control or header.control)
+    start = time.monotonic()
+    count = 0
+    try:
+        for timestamp, state in events:
+            delay = start + timestamp / speed - time.monotonic() if speed > 0 else 0
+            if stop is not None:
+                if stop.wait(max(delay, 0)):
+                    break
+            elif delay > 0:
+                time.sleep(delay)
+            handle.write_state(state, raw=header.raw)
+            count += 1
+    finally:
+        handle.close()
+    logger.debug(f"Replayed {count} ALSA mixer events from {path}")
+    return count
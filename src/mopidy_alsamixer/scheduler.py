@@ -0,0 +1,150 @@
+import dataclasses
+import functools
+import itertools
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from mopidy.types import Percentage
+
+from mopidy_alsamixer.reactor import (
+    Reactor,
+    ReactorTimer,
+    acquire_shared_reactor,
+    release_shared_reactor,
+)
+
+logger = logging.getLogger(__name__)
+
+# Timers run on the monotonic clock, but actions are scheduled in wall-clock
+# time. If a timer fires more than this many seconds early, e.g. because the
+# clock was set, the action is rescheduled instead of run.
+CLOCK_SLACK = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledAction:
+    """A volume and/or mute change to apply at a given time."""
+
+    id: int
+
+    # Time of the next run, in seconds since the epoch
+    when: float
+
+    volume: Percentage | None = None
+    mute: bool | None = None
+
+    # Seconds between runs of a recurring action, None for a one-shot action
+    interval: float | None = None
+
+    # Duration of the fade to the new volume, in milliseconds
+    fade: int = 0
+
+
+class Scheduler:
+    """Runs scheduled actions when they are due.
+
+    Actions are kept in the timer heap of a :class:`Reactor`, by default the
+    shared one, so scheduling costs O(log n), cancelling O(1), and nothing
+    runs between deadlines. ``run`` is called on the reactor thread.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[ScheduledAction], None],
+        reactor: Reactor | None = None,
+    ) -> None:
+        self.run = run
+        self._reactor = reactor if reactor is not None else acquire_shared_reactor()
+        self._owns_reactor = reactor is None
+        self._lock = threading.Lock()
+        self._entries: dict[int, tuple[ScheduledAction, ReactorTimer]] = {}
+        self._ids = itertools.count(1)
+
+    def schedule(
+        self,
+        when: float,
+        *,
+        volume: Percentage | None = None,
+        mute: bool | None = None,
+        interval: float | None = None,
+        fade: int = 0,
+    ) -> ScheduledAction:
+        if volume is None and mute is None:
+            msg = "A scheduled action needs a volume or a mute state"
+            raise ValueError(msg)
+        if volume is not None and not 0 <= volume <= 100:  # noqa: PLR2004
+            msg = f"Volume must be between 0 and 100, got {volume}"
+            raise ValueError(msg)
+        if interval is not None and interval <= 0:
+            msg = f"Interval must be positive, got {interval}"
+            raise ValueError(msg)
+        with self._lock:
+            action = ScheduledAction(
+                id=next(self._ids),
+                when=when,
+                volume=volume,
+                mute=mute,
+                interval=interval,
+                fade=fade,
+            )
+            self._start(action)
+        return action
+
+    def cancel(self, action_id: int) -> bool:
+        """Cancel an action, returning whether it was still pending."""
+        with self._lock:
+            entry = self._entries.pop(action_id, None)
+        if entry is None:
+            return False
+        entry[1].cancel()
+        return True
+
+    def pending(self) -> list[ScheduledAction]:
+        """Return all pending actions, in the order they will run."""
+        with self._lock:
+            actions = [action for action, _ in self._entries.values()]
+        return sorted(actions, key=lambda action: (action.when, action.id))
+
+    def close(self) -> None:
+        """Cancel all pending actions."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for _, timer in entries:
+            timer.cancel()
+        if self._owns_reactor:
+            release_shared_reactor()
+
+    def _start(self, action: ScheduledAction) -> None:
+        # Called with the lock held
+        timer = self._reactor.call_later(
+            max(action.when - time.time(), 0),
+            functools.partial(self._fire, action.id),
+        )
+        self._entries[action.id] = (action, timer)
+
+    def _fire(self, action_id: int) -> None:
+        with self._lock:
+            entry = self._entries.pop(action_id, None)
+            if entry is None:
+                return
+            action = entry[0]
+            now = time.time()
+            if now < action.when - CLOCK_SLACK:
+                self._start(action)
+                return
+            if action.interval is not None:
+                # Runs missed while e.g. suspended are skipped, not caught up.
+                # A timer firing within the slack still counts as this run.
+                runs = max(math.floor((now - action.when) / action.interval) + 1, 1)
+                self._start(
+                    dataclasses.replace(
+                        action, when=action.when + runs * action.interval
+                    )
+                )
+        logger.debug(f"Running scheduled ALSA mixer action {action.id}")
+        self.run(action)
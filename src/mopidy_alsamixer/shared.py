@@ -0,0 +1,455 @@
+"""Sharing one mixer observer between several processes.
+
+Processes configured with the same shared state file elect a leader by
+locking ``<path>.lock``. The leader observes the mixer control as usual, and
+writes every state it reads to the memory mapped state file, then wakes up
+the followers connected to its ``<path>.sock`` socket. Followers never touch
+ALSA for observing, and only read the state file when woken up. If the
+leader goes away, its socket hangs up, and the followers race for the lock.
+"""
+
+import contextlib
+import fcntl
+import functools
+import logging
+import mmap
+import os
+import pathlib
+import select
+import socket
+import struct
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from mopidy_alsamixer.backend import BackendError, MixerState
+from mopidy_alsamixer.reactor import (
+    Reactor,
+    ReactorTimer,
+    acquire_shared_reactor,
+    release_shared_reactor,
+)
+
+if TYPE_CHECKING:
+    from mopidy_alsamixer.mixer import AlsaMixerObserver
+
+logger = logging.getLogger(__name__)
+
+# ALSA mixer controls have at most this many channels
+MAX_CHANNELS = 32
+
+# Sequence number of the seqlock, odd while a write is in progress
+_SEQUENCE = struct.Struct("<Q")
+
+# Connected, raw, has mutes, number of channels, volumes, mutes
+_PAYLOAD = struct.Struct(f"<???B{MAX_CHANNELS}i{MAX_CHANNELS}B")
+
+STATE_FILE_SIZE = _SEQUENCE.size + _PAYLOAD.size
+
+# Times a reader retries when racing with a writer before giving up
+MAX_READ_ATTEMPTS = 100
+
+# Delay before a follower reads again after giving up, in seconds
+READ_RETRY_DELAY = 0.001
+
+# Bounds of the backoff between attempts to find a leader, in seconds
+FOLLOW_MIN_DELAY = 0.05
+FOLLOW_MAX_DELAY = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class SharedSnapshot:
+    # Incremented by every write
+    generation: int
+
+    # False while the leader has lost the device
+    connected: bool
+
+    # True if volumes are in raw hardware units instead of percentages
+    raw: bool
+
+    # None if the leader has not read the state yet
+    state: MixerState | None
+
+
+class SharedStateFile:
+    """A mixer state snapshot in a memory mapped file, guarded by a seqlock.
+
+    The writer makes the sequence number odd, writes the payload, and makes
+    it even again. Readers retry until they see the same even sequence
+    number before and after reading the payload, so they never block the
+    writer and never see a torn write.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        try:
+            if os.fstat(fd).st_size < STATE_FILE_SIZE:
+                os.ftruncate(fd, STATE_FILE_SIZE)
+            self._map = mmap.mmap(fd, STATE_FILE_SIZE)
+        finally:
+            os.close(fd)
+
+    def write(self, state: MixerState | None, *, connected: bool, raw: bool) -> None:
+        volumes = state.volumes if state is not None else ()
+        mutes = state.mutes if state is not None else None
+        if len(volumes) > MAX_CHANNELS:
+            msg = f"Expected at most {MAX_CHANNELS} channels, got {len(volumes)}"
+            raise ValueError(msg)
+        (sequence,) = _SEQUENCE.unpack_from(self._map)
+        # A leader may have died in the middle of a write
+        sequence += sequence % 2
+        _SEQUENCE.pack_into(self._map, 0, sequence + 1)
+        _PAYLOAD.pack_into(
+            self._map,
+            _SEQUENCE.size,
+            connected,
+            raw,
+            mutes is not None,
+            len(volumes) if state is not None else 0xFF,
+            *_pad(volumes),
+            *_pad(mutes or ()),
+        )
+        _SEQUENCE.pack_into(self._map, 0, sequence + 2)
+
+    def read(self) -> SharedSnapshot | None:
+        """Return the current snapshot, or None if it is being written."""
+        for _ in range(MAX_READ_ATTEMPTS):
+            (before,) = _SEQUENCE.unpack_from(self._map)
+            if before % 2:
+                # Let the writer finish, in case it runs on our CPU
+                os.sched_yield()
+                continue
+            connected, raw, has_mutes, channels, *values = _PAYLOAD.unpack_from(
+                self._map, _SEQUENCE.size
+            )
+            (after,) = _SEQUENCE.unpack_from(self._map)
+            if before != after:
+                os.sched_yield()
+                continue
+            state = None
+            if channels != 0xFF:  # noqa: PLR2004
+                volumes = tuple(values[:channels])
+                mutes = values[MAX_CHANNELS : MAX_CHANNELS + channels]
+                state = MixerState(
+                    volumes=volumes, mutes=tuple(mutes) if has_mutes else None
+                )
+            return SharedSnapshot(
+                generation=before // 2, connected=connected, raw=raw, state=state
+            )
+        return None
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def _pad(values: tuple[int, ...]) -> list[int]:
+    return [*values, *[0] * (MAX_CHANNELS - len(values))]
+
+
+type ObserverFactory = Callable[
+    [Callable[[MixerState], None], Callable[[bool], None]], AlsaMixerObserver
+]
+
+
+class SharedObserver:
+    """Observes a mixer control once for all processes sharing a state file.
+
+    ``make_observer(publish, connection_callback)`` is called to create the
+    :class:`AlsaMixerObserver` when this process becomes the leader. On
+    followers, ``publish``, ``callback`` and ``connection_callback`` are
+    called like the observer would, with the states read from the file.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: pathlib.Path,
+        make_observer: ObserverFactory,
+        *,
+        callback: Callable[[MixerState | None], None] | None = None,
+        publish: Callable[[MixerState], None] | None = None,
+        connection_callback: Callable[[bool], None] | None = None,
+        raw_volume: bool = False,
+        reactor: Reactor | None = None,
+    ) -> None:
+        self.path = path
+        self.make_observer = make_observer
+        self.callback = callback
+        self.publish = publish
+        self.connection_callback = connection_callback
+        self.raw_volume = raw_volume
+        self.running = False
+
+        self.file = SharedStateFile(path)
+        self._lock_fd = os.open(
+            path.with_name(f"{path.name}.lock"),
+            os.O_RDWR | os.O_CREAT | os.O_CLOEXEC,
+            0o644,
+        )
+        self._socket_path = path.with_name(f"{path.name}.sock")
+
+        # Set while we are the leader
+        self.observer: AlsaMixerObserver | None = None
+        self._server: socket.socket | None = None
+        self._followers: dict[int, socket.socket] = {}
+        self._followers_lock = threading.Lock()
+
+        # Set while we are a follower
+        self._leader: socket.socket | None = None
+        self._generation: int | None = None
+        self._connected = True
+        self._retry_timer: ReactorTimer | None = None
+        self._retry_delay = FOLLOW_MIN_DELAY
+        self._read_timer: ReactorTimer | None = None
+
+        self._reactor = reactor
+        self._owns_reactor = reactor is None
+        self._lock = threading.Lock()
+
+    @property
+    def leading(self) -> bool:
+        return self.observer is not None
+
+    @property
+    def suppressed_events(self) -> int:
+        return self.observer.suppressed_events if self.observer is not None else 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._reactor is None:
+                self._reactor = acquire_shared_reactor()
+            self.running = True
+            self._elect()
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self.running or self._reactor is None:
+                return
+            self.running = False
+            observer, self.observer = self.observer, None
+            self._stop_serving()
+            self._stop_following()
+            with contextlib.suppress(OSError):
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            release = self._owns_reactor
+            if release:
+                self._reactor = None
+        # The observer is stopped without holding our lock, as it calls us
+        # back with its own lock held.
+        if observer is not None:
+            observer.stop()
+            observer.close()
+        if release:
+            release_shared_reactor()
+
+    def close(self) -> None:
+        """Release the state and lock files. Call after stop()."""
+        self.file.close()
+        os.close(self._lock_fd)
+
+    def _elect(self) -> None:
+        # Called with the lock held
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._follow()
+            return
+        try:
+            self._lead()
+        except (BackendError, OSError) as exc:
+            logger.warning(f"Leading shared ALSA mixer state failed: {exc}")
+            self._stop_serving()
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            self._retry()
+
+    def _lead(self) -> None:
+        assert self._reactor is not None  # noqa: S101
+        self._socket_path.unlink(missing_ok=True)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.setblocking(False)  # noqa: FBT003
+        self._server.bind(str(self._socket_path))
+        self._server.listen()
+        self._reactor.add(self._server.fileno(), select.EPOLLIN, self._on_connect)
+
+        observer = self.make_observer(self._publish, self._connection_changed)
+        self.observer = observer
+        observer.start()
+        # The file may hold an old leader's state
+        observer.refresh()
+        logger.info(f"Leading shared ALSA mixer state at {self.path}")
+
+    def _stop_serving(self) -> None:
+        if self._server is None:
+            return
+        if self._reactor is not None:
+            self._reactor.remove(self._server.fileno())
+        self._server.close()
+        self._server = None
+        self._socket_path.unlink(missing_ok=True)
+        with self._followers_lock:
+            followers = list(self._followers.values())
+            self._followers.clear()
+        for follower in followers:
+            self._drop_follower(follower)
+
+    def _on_connect(self, _events: int) -> None:
+        server = self._server
+        if server is None:
+            return
+        while True:
+            try:
+                follower, _ = server.accept()
+            except BlockingIOError:
+                return
+            follower.setblocking(False)  # noqa: FBT003
+            with self._followers_lock:
+                self._followers[follower.fileno()] = follower
+            if self._reactor is not None:
+                # Followers never send anything, so any event is a hangup
+                self._reactor.add(
+                    follower.fileno(),
+                    select.EPOLLIN | select.EPOLLRDHUP,
+                    functools.partial(self._on_follower_gone, follower.fileno()),
+                )
+
+    def _on_follower_gone(self, fd: int, _events: int) -> None:
+        with self._followers_lock:
+            follower = self._followers.pop(fd, None)
+        if follower is not None:
+            self._drop_follower(follower)
+
+    def _drop_follower(self, follower: socket.socket) -> None:
+        if self._reactor is not None:
+            self._reactor.remove(follower.fileno())
+        follower.close()
+
+    def _publish(self, state: MixerState) -> None:
+        # Called by our observer on the reactor thread
+        self.file.write(state, connected=True, raw=self.raw_volume)
+        self._wake_followers()
+        if self.publish is not None:
+            self.publish(state)
+
+    def _connection_changed(self, connected: bool) -> None:  # noqa: FBT001
+        # Called by our observer on the reactor thread
+        self.file.write(None, connected=connected, raw=self.raw_volume)
+        self._wake_followers()
+        if self.connection_callback is not None:
+            self.connection_callback(connected)
+
+    def _wake_followers(self) -> None:
+        with self._followers_lock:
+            followers = list(self._followers.values())
+        for follower in followers:
+            # If the buffer is full, the follower has a wakeup pending anyway
+            with contextlib.suppress(BlockingIOError, OSError):
+                follower.send(b"\0")
+
+    def _follow(self) -> None:
+        # Called with the lock held
+        assert self._reactor is not None  # noqa: S101
+        leader = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            leader.connect(str(self._socket_path))
+        except OSError as exc:
+            # The leader is not serving yet, or went away without a successor
+            logger.debug(f"Connecting to shared ALSA mixer leader failed: {exc}")
+            leader.close()
+            self._retry()
+            return
+        leader.setblocking(False)  # noqa: FBT003
+        self._leader = leader
+        self._retry_delay = FOLLOW_MIN_DELAY
+        self._reactor.add(
+            leader.fileno(), select.EPOLLIN | select.EPOLLRDHUP, self._on_leader_event
+        )
+        logger.info(f"Following shared ALSA mixer state at {self.path}")
+        self._deliver()
+
+    def _stop_following(self) -> None:
+        if self._retry_timer is not None:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+        if self._read_timer is not None:
+            self._read_timer.cancel()
+            self._read_timer = None
+        if self._leader is None:
+            return
+        if self._reactor is not None:
+            self._reactor.remove(self._leader.fileno())
+        self._leader.close()
+        self._leader = None
+
+    def _retry(self) -> None:
+        if self._reactor is None:
+            return
+        self._retry_timer = self._reactor.call_later(self._retry_delay, self._on_retry)
+        self._retry_delay = min(self._retry_delay * 2, FOLLOW_MAX_DELAY)
+
+    def _on_retry(self) -> None:
+        with self._lock:
+            self._retry_timer = None
+            if self.running:
+                self._elect()
+
+    def _on_leader_event(self, events: int) -> None:
+        with self._lock:
+            leader = self._leader
+            if not self.running or leader is None:
+                return
+            gone = bool(events & (select.EPOLLHUP | select.EPOLLRDHUP))
+            try:
+                while leader.recv(4096):
+                    pass
+                gone = True
+            except BlockingIOError:
+                pass
+            except OSError:
+                gone = True
+            if gone:
+                logger.info("Shared ALSA mixer leader went away, electing a new one")
+                self._stop_following()
+                self._elect()
+                return
+            self._deliver()
+
+    def _retry_read(self) -> None:
+        # The leader is stuck in a write, and the doorbell has already been
+        # used up, so we have to come back by ourselves.
+        if self._read_timer is None and self._reactor is not None:
+            self._read_timer = self._reactor.call_later(
+                READ_RETRY_DELAY, self._on_read_retry
+            )
+
+    def _on_read_retry(self) -> None:
+        with self._lock:
+            self._read_timer = None
+            if self.running and self._leader is not None:
+                self._deliver()
+
+    def _deliver(self) -> None:
+        # Called with the lock held
+        snapshot = self.file.read()
+        if snapshot is None:
+            self._retry_read()
+            return
+        if snapshot.generation == self._generation:
+            return
+        self._generation = snapshot.generation
+        if snapshot.connected != self._connected:
+            self._connected = snapshot.connected
+            if self.connection_callback is not None:
+                self.connection_callback(snapshot.connected)
+        if snapshot.state is None or not snapshot.connected:
+            return
+        if snapshot.raw != self.raw_volume:
+            # The leader uses other units, so let the mixer read for itself
+            logger.debug("Shared ALSA mixer state uses other volume units")
+            if self.callback is not None:
+                self.callback(None)
+            return
+        if self.publish is not None:
+            self.publish(snapshot.state)
+        if self.callback is not None:
+            self.callback(snapshot.state)
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+
+from mopidy.types import Percentage
+
+
+@dataclass(frozen=True, slots=True)
+class PublishedState:
+    """Volume and mute state of the mixer, as seen by Mopidy."""
+
+    volume: Percentage | None
+    mute: bool | None
+
+    # time.monotonic() when the state last changed
+    timestamp: float
+
+    # Incremented on every change, starting at 0 before anything is known
+    generation: int
+
+
+class StatePublisher:
+    """Holds the latest :class:`PublishedState` of a mixer.
+
+    The state is replaced as a whole on every change, so :attr:`current` can
+    be read from any thread without locking or asking the mixer actor.
+    Updates are serialized by a lock, as both the actor and the observer
+    publish.
+    """
+
+    def __init__(self) -> None:
+        self.current = PublishedState(
+            volume=None, mute=None, timestamp=time.monotonic(), generation=0
+        )
+        self._lock = threading.Lock()
+
+    def publish(
+        self,
+        volume: Percentage | None,
+        mute: bool | None,  # noqa: FBT001
+    ) -> None:
+        self._update(lambda state: replace(state, volume=volume, mute=mute))
+
+    def publish_volume(self, volume: Percentage | None) -> None:
+        self._update(lambda state: replace(state, volume=volume))
+
+    def publish_mute(self, mute: bool | None) -> None:  # noqa: FBT001
+        self._update(lambda state: replace(state, mute=mute))
+
+    def _update(self, change: Callable[[PublishedState], PublishedState]) -> None:
+        with self._lock:
+            current = self.current
+            state = change(current)
+            if (state.volume, state.mute) == (current.volume, current.mute):
+                return
+            self.current = replace(
+                state, timestamp=time.monotonic(), generation=current.generation + 1
+            )
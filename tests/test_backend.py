@@ -0,0 +1,298 @@
+import contextlib
+import copy
+import select
+import threading
+import time
+import unittest
+from unittest import mock
+
+import alsaaudio
+import pytest
+from mopidy import exceptions
+
+from mopidy_alsamixer.backend import (
+    AlsaBackend,
+    BackendError,
+    MemoryBackend,
+    MemoryControl,
+    MixerBackend,
+    MixerState,
+)
+from mopidy_alsamixer.mixer import AlsaMixer, AlsaMixerObserver
+from tests import test_mixer
+
+
+@mock.patch(
+    "mopidy_alsamixer.backend.alsaaudio",
+    spec=alsaaudio,
+    ALSAAudioError=alsaaudio.ALSAAudioError,
+)
+class AlsaBackendTest(unittest.TestCase):
+    def test_translates_errors(self, alsa_mock):
+        alsa_mock.Mixer.side_effect = alsa_mock.ALSAAudioError("No such device")
+
+        with pytest.raises(BackendError, match="No such device"):
+            AlsaBackend().open("default", "Master")
+
+    def test_reads_state(self, alsa_mock):
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [50, 60]
+        mixer_mock.getmute.side_effect = alsa_mock.ALSAAudioError
+
+        handle = AlsaBackend().open("default", "Master")
+
+        assert handle.read_state(raw=True) == MixerState(volumes=(50, 60), mutes=None)
+        mixer_mock.getvolume.assert_called_once_with(units=alsa_mock.VOLUME_UNITS_RAW)
+
+
+def test_memory_handles_share_state():
+    backend = MemoryBackend()
+    first = backend.open("default", "Master")
+    second = backend.open("default", "Master")
+
+    first.write_volume(40)
+    first.write_mute(mute=True)
+
+    assert second.read_volumes() == [40, 40]
+    assert second.read_volumes(raw=True) == [102, 102]
+    assert second.read_mutes() == [1, 1]
+
+
+def test_memory_handle_signals_other_handles():
+    backend = MemoryBackend()
+    writer = backend.open("default", "Master")
+    reader = backend.open("default", "Master")
+    (fd, _), *_ = reader.poll_descriptors()
+
+    writer.write_volume(40)
+
+    assert select.select([fd], [], [], 0)[0] == [fd]
+    reader.drain_events()
+    assert select.select([fd], [], [], 0)[0] == []
+
+
+def test_memory_control_without_mute_or_db_range():
+    backend = MemoryBackend(
+        {"default": {"Master": MemoryControl(has_mute=False, db_range=None)}}
+    )
+    handle = backend.open("default", "Master")
+
+    assert handle.read_state().mutes is None
+    with pytest.raises(BackendError):
+        handle.db_range()
+
+
+def test_memory_control_errors():
+    control = MemoryControl()
+    backend = MemoryBackend({"default": {"Master": control}})
+    handle = backend.open("default", "Master")
+    control.error = "Device unplugged"
+
+    with pytest.raises(BackendError, match="Device unplugged"):
+        handle.read_volumes()
+    with pytest.raises(BackendError, match="Device unplugged"):
+        backend.open("default", "Master")
+    with pytest.raises(BackendError):
+        backend.list_controls("hw:1")
+
+
+def make_mixer(backend, **config):
+    actual_config = copy.deepcopy(test_mixer.MixerTest.default_config)
+    actual_config["alsamixer"].update(config)
+    return AlsaMixer(config=actual_config, backend=backend)
+
+
+def test_mixer_with_memory_backend():
+    backend = MemoryBackend()
+    mixer = make_mixer(backend, volume_scale="linear")
+
+    assert mixer.set_volume(30)
+    assert mixer.set_mute(True)
+
+    handle = backend.open("default", "Master")
+    assert handle.read_volumes() == [30, 30]
+    assert handle.read_mutes() == [1, 1]
+    assert mixer.get_volume() == 30
+    assert backend.opened == 2
+
+
+def test_mixer_with_channel_offsets_and_memory_backend():
+    backend = MemoryBackend()
+    mixer = make_mixer(backend, volume_scale="linear", channel_offsets=("-30",))
+
+    assert mixer.set_volume(20)
+
+    handle = backend.open("default", "Master")
+    assert handle.read_volumes() == [0, 20]
+    assert mixer.get_volume() == 20
+
+
+def test_mixer_with_db_volume_scale_and_mute_minimum():
+    backend = MemoryBackend(
+        {"default": {"Master": MemoryControl(db_range=(-9999999, 0))}}
+    )
+    mixer = make_mixer(backend, volume_scale="db")
+
+    assert mixer.set_volume(0)
+
+    assert backend.open("default", "Master").read_volumes(raw=True) == [0, 0]
+    assert mixer.get_volume() == 0
+
+
+def test_mixer_probes_controls_of_memory_backend():
+    backend = MemoryBackend(
+        {
+            "hw:0": {"Mic": MemoryControl(raw_range=(0, 0))},
+            "hw:1": {"Speaker": MemoryControl(), "PCM": MemoryControl()},
+        }
+    )
+
+    mixer = make_mixer(backend, device="auto", control="auto")
+
+    assert (mixer.device, mixer.control) == ("hw:1", "PCM")
+
+
+def test_incomplete_backend_fails_on_creation():
+    class IncompleteBackend(MixerBackend):
+        def list_cards(self):
+            return []
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()  # pyright: ignore[reportAbstractUsage]
+
+
+def test_mixer_fails_if_control_is_unknown_to_backend():
+    backend = MemoryBackend({"hw:0": {"PCM": MemoryControl()}})
+
+    with pytest.raises(exceptions.MixerError):
+        make_mixer(backend, device="hw:0", control="Master")
+
+
+def test_observer_with_memory_backend():
+    backend = MemoryBackend()
+    received = []
+    delivered = threading.Event()
+
+    def callback(state):
+        received.append(state)
+        delivered.set()
+
+    observer = AlsaMixerObserver(
+        device="default", control="Master", callback=callback, backend=backend
+    )
+    observer.start()
+    backend.open("default", "Master").write_volume(40)
+
+    assert delivered.wait(timeout=1)
+    observer.stop()
+    observer.close()
+    assert received == [MixerState(volumes=(40, 40), mutes=(0, 0))]
+
+
+@mock.patch("mopidy_alsamixer.mixer.RECONNECT_MIN_DELAY", 0.01)
+def test_observer_reconnects_to_replugged_device():
+    backend = MemoryBackend()
+    connected = []
+    received = []
+    changed = threading.Event()
+
+    def connection_callback(value):
+        connected.append(value)
+        changed.set()
+
+    observer = AlsaMixerObserver(
+        device="default",
+        control="Master",
+        callback=received.append,
+        connection_callback=connection_callback,
+        backend=backend,
+    )
+    observer.start()
+
+    backend.unplug("default")
+    assert changed.wait(timeout=1)
+    changed.clear()
+    backend.devices["default"]["Master"].raw_volumes = [0, 0]
+    backend.replug("default")
+    assert changed.wait(timeout=1)
+
+    observer.stop()
+    observer.close()
+    assert connected == [False, True]
+    assert received == [MixerState(volumes=(0, 0), mutes=(0, 0))]
+    assert backend.opened == 2
+
+
+@mock.patch("mopidy_alsamixer.mixer.RECONNECT_MIN_DELAY", 0.01)
+def test_observer_reconnects_to_replugged_linked_device():
+    backend = MemoryBackend(
+        {"default": {"Master": MemoryControl()}, "hw:1": {"PCM": MemoryControl()}}
+    )
+    connected = []
+    linked_connected = []
+    changed = threading.Event()
+
+    def linked_connection_callback(index, value):
+        linked_connected.append((index, value))
+        changed.set()
+
+    observer = AlsaMixerObserver(
+        device="default",
+        control="Master",
+        linked=[("hw:1", "PCM")],
+        connection_callback=connected.append,
+        linked_connection_callback=linked_connection_callback,
+        backend=backend,
+    )
+    observer.start()
+
+    backend.unplug("hw:1")
+    assert changed.wait(timeout=1)
+    changed.clear()
+    assert len(observer.descriptors) == 1
+    backend.replug("hw:1")
+    assert changed.wait(timeout=1)
+
+    observer.stop()
+    observer.close()
+    assert connected == []
+    assert linked_connected == [(0, False), (0, True)]
+    assert len(observer.descriptors) == 2
+
+
+@mock.patch("mopidy_alsamixer.mixer.RECONNECT_MIN_DELAY", 0.01)
+def test_mixer_keeps_writing_when_linked_device_is_unplugged():
+    backend = MemoryBackend(
+        {"default": {"Master": MemoryControl()}, "hw:1": {"PCM": MemoryControl()}}
+    )
+    config = copy.deepcopy(test_mixer.MixerTest.default_config)
+    config["alsamixer"].update(
+        volume_scale="linear", max_write_rate=0, linked_controls=("hw:1|PCM",)
+    )
+    actor_ref = AlsaMixer.start(config=config, backend=backend)
+    try:
+        proxy = actor_ref.proxy()
+        assert proxy.set_volume(50).get()
+
+        def set_volume(volume):
+            # Fails until the observer has noticed the unplugged device
+            with contextlib.suppress(BackendError):
+                return proxy.set_volume(volume).get()
+            return False
+
+        backend.unplug("hw:1")
+        deadline = time.monotonic() + 1
+        while not set_volume(60) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert backend.open("default", "Master").read_volumes() == [60, 60]
+        assert proxy.get_volume().get() == 60
+
+        backend.replug("hw:1")
+        linked = backend.open("hw:1", "PCM")
+        deadline = time.monotonic() + 1
+        while linked.read_volumes() != [60, 60] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert linked.read_volumes() == [60, 60]
+    finally:
+        actor_ref.stop()
@@ -0,0 +1,137 @@
+import json
+
+from mopidy_alsamixer.backend import MemoryBackend, MemoryControl
+from mopidy_alsamixer.discovery import DiscoveryCache, fingerprint, probe
+
+
+def make_cache(tmp_path, cards="0 [PCH ]: HDA-Intel - HDA Intel PCH\n"):
+    cards_path = tmp_path / "cards"
+    cards_path.write_text(cards)
+    return DiscoveryCache(tmp_path / "discovery.json", cards_path=cards_path)
+
+
+def test_fingerprint_changes_with_cards(tmp_path):
+    cards_path = tmp_path / "cards"
+    cards_path.write_text("0 [PCH ]: HDA-Intel - HDA Intel PCH\n")
+    first = fingerprint(cards_path)
+    cards_path.write_text("1 [DAC ]: USB-Audio - USB DAC\n")
+
+    assert first is not None
+    assert fingerprint(cards_path) != first
+
+
+def test_fingerprint_without_cards(tmp_path):
+    assert fingerprint(tmp_path / "missing") is None
+
+
+def test_cache_is_empty_initially(tmp_path):
+    cache = make_cache(tmp_path)
+
+    assert cache.get_controls("default") is None
+
+
+def test_saved_controls_are_loaded(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_controls("default", ["Master", "PCM"])
+    cache.save()
+
+    cache = make_cache(tmp_path)
+
+    assert cache.get_controls("default") == ["Master", "PCM"]
+
+
+def test_cache_is_discarded_when_cards_change(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_controls("default", ["Master"])
+    cache.save()
+
+    cache = make_cache(tmp_path, cards="1 [DAC ]: USB-Audio - USB DAC\n")
+
+    assert cache.get_controls("default") is None
+
+
+def test_nothing_is_saved_without_fingerprint(tmp_path):
+    cache = DiscoveryCache(tmp_path / "discovery.json", cards_path=tmp_path / "x")
+    cache.set_controls("default", ["Master"])
+
+    cache.save()
+
+    assert not (tmp_path / "discovery.json").exists()
+
+
+def test_invalid_cache_file_is_ignored(tmp_path):
+    (tmp_path / "discovery.json").write_text("not json")
+
+    cache = make_cache(tmp_path)
+
+    assert cache.get_controls("default") is None
+
+
+def test_invalidate_removes_cache_file(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_controls("default", ["Master"])
+    cache.save()
+    assert (
+        "Master"
+        in json.loads((tmp_path / "discovery.json").read_text())["controls"]["default"]
+    )
+
+    cache.invalidate()
+
+    assert cache.get_controls("default") is None
+    assert not (tmp_path / "discovery.json").exists()
+
+
+def make_probe_backend():
+    # Controls without playback volume have an empty volume range
+    return MemoryBackend(
+        {
+            "hw:0": {
+                "Master": MemoryControl(channels=1),
+                "Capture": MemoryControl(raw_range=(0, 0), has_mute=False),
+            },
+            "hw:1": {
+                "PCM": MemoryControl(channels=2),
+                "Beep": MemoryControl(raw_range=(0, 0), has_mute=False),
+            },
+        }
+    )
+
+
+def test_probe_picks_best_control():
+    result = probe(make_probe_backend(), ["hw:0", "hw:1"])
+
+    assert result is not None
+    assert (result.device, result.control) == ("hw:0", "Master")
+
+
+def test_probe_only_considers_given_controls():
+    result = probe(make_probe_backend(), ["hw:0", "hw:1"], ["PCM"])
+
+    assert result is not None
+    assert (result.device, result.control) == ("hw:1", "PCM")
+
+
+def test_probe_ignores_unknown_devices():
+    result = probe(make_probe_backend(), ["hw:2", "hw:1"])
+
+    assert result is not None
+    assert result.device == "hw:1"
+
+
+def test_probe_returns_none_without_playback_volume():
+    assert probe(make_probe_backend(), ["hw:0"], ["Capture"]) is None
+
+
+def test_probe_prefers_controls_with_mute_switch():
+    backend = MemoryBackend(
+        {
+            "hw:0": {"Front": MemoryControl(has_mute=False)},
+            "hw:1": {"Front": MemoryControl()},
+        }
+    )
+
+    result = probe(backend, ["hw:0", "hw:1"])
+
+    assert result is not None
+    assert result.device == "hw:1"
@@ -19,6 +19,18 @@ def test_get_default_config():
     assert "device" in schema
     assert "card" in schema
     assert "control" in schema
+    assert "linked_controls" in schema
+    assert "channel_offsets" in schema
+    assert "discovery_cache" in schema
+    assert "coalesce_window" in schema
+    assert "cache_state" in schema
+    assert "max_write_rate" in schema
+    assert "ramp_threshold" in schema
+    assert "ramp_time" in schema
+    assert "metrics" in schema
+    assert "metrics_log_interval" in schema
+    assert "record_events" in schema
+    assert "shared_state" in schema
 
 
 def test_setup():
@@ -0,0 +1,73 @@
+import logging
+from unittest import mock
+
+from mopidy_alsamixer.metrics import Metrics, MetricsLogger, format_stats, timed
+
+
+class Timed:
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @timed("operation")
+    def operation(self, value):
+        return value * 2
+
+
+def test_counters():
+    metrics = Metrics()
+
+    metrics.increment("errors")
+    metrics.increment("errors", 2)
+
+    assert metrics.snapshot()["counters"] == {"errors": 3}
+
+
+def test_histogram_buckets():
+    metrics = Metrics()
+
+    metrics.observe("get_volume", 5e-6)
+    metrics.observe("get_volume", 200e-6)
+    metrics.observe("get_volume", 1.0)
+
+    histogram = metrics.snapshot()["latency"]["get_volume"]
+    assert histogram["count"] == 3
+    assert histogram["max_us"] == 1e6
+    assert histogram["buckets"]["<=10us"] == 1
+    assert histogram["buckets"]["<=250us"] == 1
+    assert histogram["buckets"][">100000us"] == 1
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+
+    metrics.increment("errors")
+    assert Timed(metrics).operation(2) == 4
+
+    assert metrics.snapshot() == {"counters": {}, "latency": {}}
+
+
+def test_timed_records_latency():
+    metrics = Metrics()
+
+    assert Timed(metrics).operation(2) == 4
+
+    assert metrics.snapshot()["latency"]["operation"]["count"] == 1
+
+
+def test_format_stats():
+    metrics = Metrics()
+    metrics.increment("wakeups", 3)
+    metrics.observe("set_volume", 100e-6)
+
+    assert format_stats(metrics.snapshot()) == "wakeups=3 set_volume=1x100us(max 100us)"
+
+
+def test_metrics_logger_logs_until_stopped(caplog):
+    stats = mock.Mock(return_value={"counters": {"errors": 1}, "latency": {}})
+    metrics_logger = MetricsLogger(stats=stats, interval=0)
+    stats.side_effect = lambda: metrics_logger.stop() or stats.return_value
+
+    with caplog.at_level(logging.DEBUG, logger="mopidy_alsamixer.metrics"):
+        metrics_logger.run()
+
+    assert caplog.messages == ["ALSA mixer stats: errors=1"]
@@ -1,17 +1,33 @@
 import copy
+import os
+import select
+import threading
+import time
 import unittest
 from typing import Any, ClassVar
 from unittest import mock
 
 import alsaaudio
+import pykka
 import pytest
 from mopidy import exceptions
 
-from mopidy_alsamixer.mixer import AlsaMixer
+from mopidy_alsamixer.backend import BackendError
+from mopidy_alsamixer.discovery import ProbeResult
+from mopidy_alsamixer.mixer import (
+    RECONNECT_MAX_DELAY,
+    RECONNECT_MIN_DELAY,
+    AlsaMixer,
+    AlsaMixerObserver,
+    MixerState,
+    VolumeFader,
+)
+from mopidy_alsamixer.reactor import Reactor
+from mopidy_alsamixer.scheduler import ScheduledAction
 
 
 @mock.patch(
-    "mopidy_alsamixer.mixer.alsaaudio",
+    "mopidy_alsamixer.backend.alsaaudio",
     spec=alsaaudio,
     ALSAAudioError=alsaaudio.ALSAAudioError,
 )
@@ -21,12 +37,34 @@ class MixerTest(unittest.TestCase):
             "device": "default",
             "card": None,
             "control": "Master",
+            "linked_controls": (),
+            "channel_offsets": (),
+            "discovery_cache": False,
             "min_volume": 0,
             "max_volume": 100,
             "volume_scale": "cubic",
+            "coalesce_window": 50,
+            "cache_state": True,
+            "max_write_rate": 20,
+            "ramp_threshold": 0,
+            "ramp_time": 200,
+            "metrics": False,
+            "metrics_log_interval": 0,
+            "record_events": None,
+            "shared_state": None,
         }
     }
 
+    def setUp(self):
+        # Deferred writes and fade steps are scheduled on the reactor, which
+        # is never run
+        patcher = mock.patch("mopidy_alsamixer.mixer.acquire_shared_reactor")
+        self.reactor = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("mopidy_alsamixer.mixer.release_shared_reactor")
+        self.release_reactor = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def get_mixer(self, alsa_mock=None, *, config=None, apply_default_config=True):
         if config is None:
             config = {"alsamixer": {"device": "default", "control": "Master"}}
@@ -150,6 +188,427 @@ class MixerTest(unittest.TestCase):
         assert "Could not find ALSA mixer control" in str(exc_info.value)
         assert "include: Headphone, Master" in str(exc_info.value)
 
+    @mock.patch("mopidy_alsamixer.mixer.probe")
+    def test_auto_control(self, probe_mock, alsa_mock):
+        probe_mock.return_value = ProbeResult(device="PCH", control="PCM", score=1)
+        alsa_mock.mixers.return_value = ["Master", "PCM"]
+        config = {"alsamixer": {"device": "PCH", "control": "auto"}}
+
+        mixer = self.get_mixer(config=config)
+        mixer.get_volume()
+
+        probe_mock.assert_called_once_with(mixer.backend, ["PCH"], [])
+        alsa_mock.Mixer.assert_called_once_with(device="PCH", control="PCM")
+
+    @mock.patch("mopidy_alsamixer.mixer.probe")
+    def test_auto_device(self, probe_mock, alsa_mock):
+        probe_mock.return_value = ProbeResult(device="hw:2", control="PCM", score=1)
+        alsa_mock.card_indexes.return_value = [0, 2]
+        alsa_mock.mixers.return_value = ["PCM"]
+        config = {"alsamixer": {"device": "auto", "control": "PCM"}}
+
+        mixer = self.get_mixer(config=config)
+        mixer.get_volume()
+
+        probe_mock.assert_called_once_with(mixer.backend, ["hw:0", "hw:2"], ["PCM"])
+        alsa_mock.Mixer.assert_called_once_with(device="hw:2", control="PCM")
+
+    @mock.patch("mopidy_alsamixer.mixer.probe")
+    def test_fails_if_auto_finds_nothing(self, probe_mock, alsa_mock):
+        probe_mock.return_value = None
+        config = {"alsamixer": {"control": "auto"}}
+
+        with pytest.raises(exceptions.MixerError) as exc_info:
+            self.get_mixer(alsa_mock, config=config)
+
+        assert "Could not find any ALSA mixer control" in str(exc_info.value)
+
+    @mock.patch("mopidy_alsamixer.Extension.get_cache_dir")
+    @mock.patch("mopidy_alsamixer.mixer.DiscoveryCache")
+    def test_discovery_cache_hit(self, cache_mock, get_cache_dir_mock, alsa_mock):
+        cache_mock.return_value.get_controls.return_value = ["Master"]
+        config = {"alsamixer": {"discovery_cache": True}}
+
+        self.get_mixer(alsa_mock, config=config)
+
+        cache_mock.return_value.get_controls.assert_called_once_with("default")
+        assert alsa_mock.mixers.call_count == 0
+
+    @mock.patch("mopidy_alsamixer.Extension.get_cache_dir")
+    @mock.patch("mopidy_alsamixer.mixer.DiscoveryCache")
+    def test_discovery_cache_miss(self, cache_mock, get_cache_dir_mock, alsa_mock):
+        cache_mock.return_value.get_controls.return_value = None
+        config = {"alsamixer": {"discovery_cache": True}}
+
+        self.get_mixer(alsa_mock, config=config)
+
+        alsa_mock.mixers.assert_called_once_with(device="default")
+        cache_mock.return_value.set_controls.assert_called_once_with(
+            "default", ["Master"]
+        )
+        cache_mock.return_value.save.assert_called_once_with()
+
+    @mock.patch("mopidy_alsamixer.Extension.get_cache_dir")
+    @mock.patch("mopidy_alsamixer.mixer.DiscoveryCache")
+    def test_discovery_cache_is_invalidated_if_opening_fails(
+        self, cache_mock, get_cache_dir_mock, alsa_mock
+    ):
+        cache_mock.return_value.get_controls.return_value = ["Master"]
+        config = {"alsamixer": {"discovery_cache": True}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        alsa_mock.Mixer.side_effect = alsa_mock.ALSAAudioError
+
+        with pytest.raises(BackendError):
+            mixer.get_volume()
+
+        cache_mock.return_value.invalidate.assert_called_once_with()
+
+    def test_reuses_mixer_between_calls(self, alsa_mock):
+        config = {"alsamixer": {"cache_state": False}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+        mixer_mock.getmute.return_value = [0]
+
+        mixer.get_volume()
+        mixer.set_volume(50)
+        mixer.get_mute()
+        mixer.set_mute(True)
+
+        alsa_mock.Mixer.assert_called_once_with(device="default", control="Master")
+        assert mixer_mock.handleevents.call_count == 3
+
+    def test_reopens_mixer_if_handling_events_fails(self, alsa_mock):
+        config = {"alsamixer": {"cache_state": False}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+        mixer.get_volume()
+        mixer_mock.handleevents.side_effect = alsa_mock.ALSAAudioError
+
+        mixer.get_volume()
+
+        assert alsa_mock.Mixer.call_count == 2
+        mixer_mock.close.assert_called_once_with()
+
+    def test_get_volume_and_mute_from_cached_state(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+        mixer_mock.getmute.return_value = [0]
+
+        assert mixer.get_volume() == 63
+        assert mixer.get_volume() == 63
+        assert mixer.get_mute() is False
+
+        mixer_mock.getvolume.assert_called_once_with()
+        mixer_mock.getmute.assert_called_once_with()
+
+    def test_answers_from_last_known_state_while_device_is_gone(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+        mixer_mock.getmute.return_value = [0]
+        mixer.get_volume()
+        alsa_mock.Mixer.reset_mock()
+
+        mixer.set_device_connected(False)
+
+        assert mixer.get_volume() == 63
+        assert mixer.get_mute() is False
+        assert mixer.set_volume(20) is False
+        assert mixer.set_mute(True) is False
+        mixer_mock.close.assert_called_once_with()
+        alsa_mock.Mixer.assert_not_called()
+        mixer_mock.getvolume.assert_not_called()
+        mixer_mock.setvolume.assert_not_called()
+        mixer_mock.setmute.assert_not_called()
+
+    def test_reads_from_alsa_again_when_device_is_back(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+        mixer.get_volume()
+        mixer.set_device_connected(False)
+        mixer_mock.getvolume.return_value = [100]
+
+        mixer.set_device_connected(True)
+
+        assert mixer.get_volume() == 100
+        assert alsa_mock.Mixer.call_count == 2
+
+    def test_runs_scheduled_action(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        mixer.run_scheduled_action(ScheduledAction(id=1, when=0, volume=20, mute=True))
+
+        mixer_mock.setvolume.assert_called_once_with(20)
+        mixer_mock.setmute.assert_called_once_with(1)
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    def test_lists_and_cancels_scheduled_actions(self, actor_ref_mock, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        assert mixer.get_scheduled() == []
+
+        action = mixer.schedule(time.time() + 3600, volume=10, interval=86400)
+
+        assert mixer.get_scheduled() == [action]
+        assert mixer.cancel_scheduled(action.id)
+        assert mixer.get_scheduled() == []
+        mixer.on_stop()
+
+    def test_publishes_own_changes(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        publisher = mixer.get_state_publisher()
+
+        mixer.set_volume(30)
+        mixer.set_mute(True)
+
+        assert publisher.current.volume == 30
+        assert publisher.current.mute is True
+        assert publisher.current.generation == 2
+
+    def test_publishes_observed_changes(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        state = MixerState(volumes=(70, 70), mutes=(1, 1))
+
+        mixer.publish_observed_state(state)
+        published = mixer.state.current
+        mixer.trigger_events_for_changed_values(state)
+
+        assert (published.volume, published.mute) == (70, True)
+        assert mixer.state.current is published
+
+    def test_does_not_publish_outdated_observed_volume(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 1}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer.set_volume(30)
+        mixer.set_volume(40)
+        state = MixerState(volumes=(30, 30), mutes=(0, 0))
+
+        mixer.publish_observed_state(state)
+        mixer.trigger_events_for_changed_values(state)
+        mixer.on_stop()
+
+        assert mixer.state.current.volume == 40
+        assert mixer.state.current.mute is False
+
+    def test_writes_update_cached_state(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86, 86]
+        mixer_mock.getmute.return_value = [0, 0]
+        mixer.get_volume()
+
+        mixer.set_volume(50)
+        mixer.set_mute(True)
+
+        assert mixer.get_volume() == 50
+        assert mixer.get_mute() is True
+        mixer_mock.getvolume.assert_called_once_with()
+
+    def test_failed_write_invalidates_cached_state(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+        mixer.get_volume()
+        mixer_mock.setvolume.side_effect = alsa_mock.ALSAAudioError
+
+        with pytest.raises(BackendError):
+            mixer.set_volume(50)
+        mixer.get_volume()
+
+        assert mixer_mock.getvolume.call_count == 2
+
+    def test_set_volume_skips_write_if_volume_is_unchanged(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [50, 50]
+        mixer.get_volume()
+
+        assert mixer.set_volume(50)
+
+        mixer_mock.setvolume.assert_not_called()
+        assert mixer.elided_writes == 1
+
+    def test_set_mute_skips_write_if_mute_is_unchanged(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [50]
+        mixer_mock.getmute.return_value = [1]
+        mixer.get_mute()
+
+        assert mixer.set_mute(True)
+        assert mixer.set_mute(False)
+
+        mixer_mock.setmute.assert_called_once_with(0)
+        assert mixer.elided_writes == 1
+
+    def test_writes_are_not_skipped_with_linked_controls(self, alsa_mock):
+        config = {
+            "alsamixer": {
+                "volume_scale": "linear",
+                "max_write_rate": 0,
+                "linked_controls": ("hw:1|PCM",),
+            }
+        }
+        mixers = {"default": mock.Mock(), "hw:1": mock.Mock()}
+        mixers["default"].getvolume.return_value = [50]
+        mixers["default"].getmute.return_value = [1]
+        alsa_mock.Mixer.side_effect = lambda device, control: mixers[device]
+        alsa_mock.mixers.return_value = ["Master", "PCM"]
+        mixer = self.get_mixer(config=config)
+        mixer.get_volume()
+
+        assert mixer.set_volume(50)
+        assert mixer.set_mute(True)
+
+        mixers["hw:1"].setvolume.assert_called_once_with(50)
+        mixers["hw:1"].setmute.assert_called_once_with(1)
+        assert mixer.elided_writes == 0
+
+    def test_writes_are_not_skipped_without_cache(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "cache_state": False}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [50]
+
+        assert mixer.set_volume(50)
+
+        mixer_mock.setvolume.assert_called_once_with(50)
+        assert mixer.elided_writes == 0
+
+    def test_get_stats(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "metrics": True}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [50]
+        mixer_mock.getmute.return_value = [0]
+        mixer_mock.setmute.side_effect = alsa_mock.ALSAAudioError
+        mixer.get_volume()
+
+        mixer.set_volume(50)
+        mixer.set_volume(60)
+        mixer.set_mute(True)
+
+        stats = mixer.get_stats()
+        assert stats["counters"] == {
+            "device_opens": 1,
+            "elided_writes": 1,
+            "errors": 1,
+        }
+        assert stats["latency"]["set_volume"]["count"] == 2
+        assert stats["latency"]["set_mute"]["count"] == 1
+
+    def test_get_stats_without_metrics(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [50]
+
+        mixer.get_volume()
+
+        assert mixer.get_stats() == {
+            "counters": {"elided_writes": 0},
+            "latency": {},
+        }
+
+    def test_get_volume_without_cache(self, alsa_mock):
+        config = {"alsamixer": {"cache_state": False}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [86]
+
+        mixer.get_volume()
+        mixer.get_volume()
+
+        assert mixer_mock.getvolume.call_count == 2
+        assert mixer_mock.getmute.call_count == 0
+
+    def test_writes_to_linked_controls(self, alsa_mock):
+        config = {
+            "alsamixer": {
+                "volume_scale": "linear",
+                "linked_controls": ("hw:1|PCM|-10", "hw:2|Headphone"),
+            }
+        }
+        mixers = {
+            "default": mock.Mock(),
+            "hw:1": mock.Mock(),
+            "hw:2": mock.Mock(),
+        }
+        alsa_mock.Mixer.side_effect = lambda device, control: mixers[device]
+        alsa_mock.mixers.return_value = ["Master", "PCM", "Headphone"]
+        mixer = self.get_mixer(config=config)
+
+        assert mixer.set_volume(50)
+        assert mixer.set_mute(True)
+
+        mixers["default"].setvolume.assert_called_once_with(50)
+        mixers["hw:1"].setvolume.assert_called_once_with(40)
+        mixers["hw:2"].setvolume.assert_called_once_with(50)
+        for mixer_mock in mixers.values():
+            mixer_mock.setmute.assert_called_once_with(1)
+        assert alsa_mock.mixers.call_args_list == [
+            mock.call(device="default"),
+            mock.call(device="hw:1"),
+            mock.call(device="hw:2"),
+        ]
+
+    def test_skips_lost_linked_control_until_it_is_back(self, alsa_mock):
+        config = {
+            "alsamixer": {
+                "volume_scale": "linear",
+                "linked_controls": ("hw:1|PCM|-10",),
+            }
+        }
+        mixers = {"default": mock.Mock(), "hw:1": mock.Mock()}
+        mixers["default"].getvolume.return_value = [30, 30]
+        mixers["default"].getmute.return_value = [0, 0]
+        alsa_mock.Mixer.side_effect = lambda device, control: mixers[device]
+        alsa_mock.mixers.return_value = ["Master", "PCM"]
+        mixer = self.get_mixer(config=config)
+
+        mixer.set_linked_connected(0, False)  # noqa: FBT003
+        assert mixer.set_volume(50)
+
+        mixers["default"].setvolume.assert_called_once_with(50)
+        mixers["hw:1"].setvolume.assert_not_called()
+
+        mixers["default"].getvolume.return_value = [50, 50]
+        mixer.set_linked_connected(0, True)  # noqa: FBT003
+
+        mixers["hw:1"].setvolume.assert_called_once_with(40)
+        mixers["hw:1"].setmute.assert_called_once_with(0)
+
+    def test_fails_if_linked_control_is_invalid(self, alsa_mock):
+        config = {"alsamixer": {"linked_controls": ("hw:1",)}}
+
+        with pytest.raises(exceptions.MixerError) as exc_info:
+            self.get_mixer(alsa_mock, config=config)
+
+        assert "Invalid linked control 'hw:1'" in str(exc_info.value)
+
+    def test_fails_if_linked_control_is_unknown(self, alsa_mock):
+        alsa_mock.cards.return_value = ["PCH", "SB"]
+        alsa_mock.mixers.side_effect = lambda device: {
+            "default": ["Master"],
+            "hw:1": ["Master"],
+        }[device]
+        config = {"alsamixer": {"linked_controls": ("hw:1|PCM",)}}
+
+        with pytest.raises(exceptions.MixerError) as exc_info:
+            self.get_mixer(config=config)
+
+        assert "Could not find ALSA mixer control PCM on device 'hw:1'" in str(
+            exc_info.value
+        )
+
     def test_get_volume(self, alsa_mock):
         config = {"alsamixer": {"volume_scale": "linear"}}
         mixer = self.get_mixer(alsa_mock, config=config)
@@ -225,6 +684,371 @@ class MixerTest(unittest.TestCase):
 
         mixer_mock.setvolume.assert_called_once_with(93)
 
+    def test_set_volume_log_to_zero(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "log"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        assert mixer.set_volume(0)
+
+        mixer_mock.setvolume.assert_called_once_with(0)
+
+    def test_set_volume_with_channel_offsets(self, alsa_mock):
+        alsa_mock.Mixer.return_value.getvolume.return_value = [50, 50]
+        config = {
+            "alsamixer": {"volume_scale": "linear", "channel_offsets": ("0", "-20")}
+        }
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        assert mixer.set_volume(74)
+
+        assert mixer_mock.setvolume.call_args_list == [
+            mock.call(74, channel=0, units=alsa_mock.VOLUME_UNITS_PERCENTAGE),
+            mock.call(54, channel=1, units=alsa_mock.VOLUME_UNITS_PERCENTAGE),
+        ]
+
+    def test_get_volume_with_channel_offsets_from_loudest_channel(self, alsa_mock):
+        alsa_mock.Mixer.return_value.getvolume.return_value = [40, 70]
+        config = {
+            "alsamixer": {"volume_scale": "linear", "channel_offsets": ("-20", "0")}
+        }
+        mixer = self.get_mixer(alsa_mock, config=config)
+
+        assert mixer.get_volume() == 70
+
+    def test_set_volume_with_channel_offsets_is_elided(self, alsa_mock):
+        alsa_mock.Mixer.return_value.getvolume.return_value = [74, 54]
+        config = {
+            "alsamixer": {"volume_scale": "linear", "channel_offsets": ("0", "-20")}
+        }
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        assert mixer.get_volume() == 74
+        assert mixer.set_volume(74)
+
+        mixer_mock.setvolume.assert_not_called()
+
+    def test_set_channel_offsets_rewrites_volume(self, alsa_mock):
+        alsa_mock.Mixer.return_value.getvolume.return_value = [60, 60]
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        assert mixer.set_channel_offsets([-10, 0])
+
+        assert mixer.get_channel_offsets() == [-10, 0]
+        assert mixer.get_volume() == 60
+        assert mixer_mock.setvolume.call_args_list == [
+            mock.call(50, channel=0, units=alsa_mock.VOLUME_UNITS_PERCENTAGE),
+            mock.call(60, channel=1, units=alsa_mock.VOLUME_UNITS_PERCENTAGE),
+        ]
+
+    def test_set_channel_offsets_keeps_offsets_if_reading_channels_fails(
+        self, alsa_mock
+    ):
+        alsa_mock.Mixer.return_value.getvolume.return_value = [60, 60]
+        config = {
+            "alsamixer": {"volume_scale": "linear", "channel_offsets": ("0", "-20")}
+        }
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        # The volume is then read from the cache, but the channels are not
+        assert mixer.get_volume() == 60
+        mixer_mock.getvolume.side_effect = alsa_mock.ALSAAudioError
+
+        assert not mixer.set_channel_offsets([-10, 0])
+
+        mixer_mock.getvolume.side_effect = None
+        assert mixer.get_channel_offsets() == [0, -20]
+        assert mixer.set_volume(50)
+        assert mixer_mock.setvolume.call_args_list == [
+            mock.call(50, channel=0, units=alsa_mock.VOLUME_UNITS_PERCENTAGE),
+            mock.call(30, channel=1, units=alsa_mock.VOLUME_UNITS_PERCENTAGE),
+        ]
+
+    def test_set_channel_offsets_is_refused_while_device_is_gone(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer.set_device_connected(False)
+
+        assert not mixer.set_channel_offsets([-10, 0])
+        assert mixer.get_channel_offsets() == []
+
+    def test_set_channel_offsets_refuses_invalid_offsets(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+
+        assert not mixer.set_channel_offsets([0, 200])
+        assert mixer.get_channel_offsets() == []
+
+    def test_fails_if_channel_offsets_are_invalid(self, alsa_mock):
+        config = {"alsamixer": {"channel_offsets": ("left",)}}
+
+        with pytest.raises(exceptions.MixerError):
+            self.get_mixer(alsa_mock, config=config)
+
+    def test_get_volume_with_min_and_max_volume(self, alsa_mock):
+        config = {
+            "alsamixer": {
+                "min_volume": 30,
+                "max_volume": 70,
+                "volume_scale": "cubic",
+            }
+        }
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [mixer.volume_to_mixer_volume(100)]
+
+        assert mixer.get_volume() == 95
+
+    def test_volume_tables_are_monotonic(self, alsa_mock):
+        for volume_scale in ("linear", "cubic", "log"):
+            config = {"alsamixer": {"volume_scale": volume_scale}}
+            mixer = self.get_mixer(alsa_mock, config=config)
+
+            mixer_volumes = [mixer.volume_to_mixer_volume(v) for v in range(101)]
+            volumes = [mixer.mixer_volume_to_volume(v) for v in range(101)]
+
+            assert mixer_volumes == sorted(mixer_volumes)
+            assert volumes == sorted(volumes)
+            assert mixer_volumes[0] == 0
+            assert mixer_volumes[100] == 100
+
+    def set_native_ranges(self, alsa_mock, db_range=(-5100, 0)):
+        def getrange(units):
+            if units is alsa_mock.VOLUME_UNITS_DB and db_range is None:
+                raise alsaaudio.ALSAAudioError
+            if units is alsa_mock.VOLUME_UNITS_DB:
+                return db_range
+            return (0, 255)
+
+        alsa_mock.Mixer.return_value.getrange.side_effect = getrange
+
+    def test_set_volume_raw(self, alsa_mock):
+        self.set_native_ranges(alsa_mock)
+        config = {"alsamixer": {"volume_scale": "raw"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        assert mixer.set_volume(50)
+
+        mixer_mock.setvolume.assert_called_once_with(
+            128, units=alsa_mock.VOLUME_UNITS_RAW
+        )
+
+    def test_get_volume_db(self, alsa_mock):
+        self.set_native_ranges(alsa_mock)
+        config = {"alsamixer": {"volume_scale": "db", "cache_state": False}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [mixer.volume_to_mixer_volume(37)]
+
+        assert mixer.get_volume() == 37
+
+        mixer_mock.getvolume.assert_called_once_with(units=alsa_mock.VOLUME_UNITS_RAW)
+
+    def test_native_volume_scales_round_trip_exactly(self, alsa_mock):
+        self.set_native_ranges(alsa_mock)
+        for volume_scale in ("raw", "db"):
+            config = {"alsamixer": {"volume_scale": volume_scale}}
+            mixer = self.get_mixer(alsa_mock, config=config)
+
+            mixer_volumes = [mixer.volume_to_mixer_volume(v) for v in range(101)]
+
+            assert mixer_volumes[0] == 0
+            assert mixer_volumes[100] == 255
+            assert [mixer.mixer_volume_to_volume(m) for m in mixer_volumes] == list(
+                range(101)
+            )
+
+    def test_db_volume_scale_with_mute_minimum(self, alsa_mock):
+        self.set_native_ranges(alsa_mock, db_range=(-9999999, 0))
+        config = {"alsamixer": {"volume_scale": "db"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+
+        mixer_volumes = [mixer.volume_to_mixer_volume(v) for v in range(101)]
+
+        assert mixer_volumes[0] == 0
+        assert mixer_volumes[1] < 10
+        assert mixer_volumes[50] == 128
+        assert mixer_volumes[100] == 255
+
+    def test_db_volume_scale_falls_back_to_raw(self, alsa_mock):
+        self.set_native_ranges(alsa_mock, db_range=None)
+        config = {"alsamixer": {"volume_scale": "db"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+
+        assert mixer.volume_to_mixer_volume(50) == 128
+
+    def test_native_volume_scale_writes_linked_controls_as_percentages(self, alsa_mock):
+        config = {
+            "alsamixer": {
+                "volume_scale": "raw",
+                "linked_controls": ("hw:1|PCM|-10",),
+            }
+        }
+        mixers = {"default": mock.Mock(), "hw:1": mock.Mock()}
+        mixers["default"].getrange.return_value = (0, 255)
+        alsa_mock.Mixer.side_effect = lambda device, control: mixers[device]
+        alsa_mock.mixers.return_value = ["Master", "PCM"]
+        mixer = self.get_mixer(config=config)
+
+        assert mixer.set_volume(50)
+
+        mixers["default"].setvolume.assert_called_once_with(
+            128, units=alsa_mock.VOLUME_UNITS_RAW
+        )
+        mixers["hw:1"].setvolume.assert_called_once_with(40)
+
+    def test_set_volume_is_rate_limited(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 10}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        assert mixer.set_volume(10)
+        assert mixer.set_volume(20)
+        assert mixer.set_volume(30)
+
+        mixer_mock.setvolume.assert_called_once_with(10)
+        self.reactor.call_later.assert_called_once_with(mock.ANY, mock.ANY)
+
+        mixer.flush_pending_volume()
+
+        assert mixer_mock.setvolume.call_count == 2
+        mixer_mock.setvolume.assert_called_with(30)
+
+    def test_stop_writes_pending_volume_and_releases_reactor(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 10}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer.set_volume(10)
+        mixer.set_volume(20)
+
+        mixer.on_stop()
+
+        self.reactor.call_later.return_value.cancel.assert_called_once_with()
+        mixer_mock.setvolume.assert_called_with(20)
+        self.release_reactor.assert_called_once_with()
+
+    def test_set_volume_without_rate_limit(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 0}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+
+        mixer.set_volume(10)
+        mixer.set_volume(20)
+
+        assert mixer_mock.setvolume.call_args_list == [mock.call(10), mock.call(20)]
+
+    def test_stale_volume_is_not_reported_while_write_is_pending(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 10}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer.trigger_volume_changed = mock.Mock()
+        mixer.set_volume(10)
+        mixer.set_volume(20)
+
+        mixer.trigger_events_for_changed_values(MixerState(volumes=(10,), mutes=None))
+
+        assert mixer.trigger_volume_changed.call_count == 0
+
+        mixer.flush_pending_volume()
+        mixer.trigger_events_for_changed_values(MixerState(volumes=(20,), mutes=None))
+
+        mixer.trigger_volume_changed.assert_called_once_with(20)
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    @mock.patch("mopidy_alsamixer.mixer.VolumeFader")
+    def test_fade_volume(self, fader_mock, actor_ref_mock, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [20]
+
+        assert mixer.fade_volume(60, 200)
+
+        assert mixer_mock.setvolume.call_count == 0
+        fader_mock.assert_called_once_with(
+            volumes=[30, 40, 50, 60],
+            interval=0.05,
+            callback=mock.ANY,
+            reactor=self.reactor,
+        )
+        fader_mock.return_value.start.assert_called_once_with()
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    @mock.patch("mopidy_alsamixer.mixer.VolumeFader")
+    def test_fade_steps_are_written(self, fader_mock, actor_ref_mock, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 0}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer.trigger_volume_changed = mock.Mock()
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [20]
+        mixer.fade_volume(40, 100)
+        callback = fader_mock.call_args.kwargs["callback"]
+        generation = callback.args[0]
+
+        mixer.apply_fade_step(generation, 30)
+        mixer.trigger_events_for_changed_values(MixerState(volumes=(30,), mutes=None))
+        mixer.apply_fade_step(generation, 40, last=True)
+        mixer.trigger_events_for_changed_values(MixerState(volumes=(40,), mutes=None))
+
+        assert mixer_mock.setvolume.call_args_list == [mock.call(30), mock.call(40)]
+        mixer.trigger_volume_changed.assert_called_once_with(40)
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    @mock.patch("mopidy_alsamixer.mixer.VolumeFader")
+    def test_set_volume_cancels_fade(self, fader_mock, actor_ref_mock, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear", "max_write_rate": 0}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [20]
+        mixer.fade_volume(60, 200)
+        generation = fader_mock.call_args.kwargs["callback"].args[0]
+
+        mixer.set_volume(10)
+        mixer.apply_fade_step(generation, 30)
+
+        fader_mock.return_value.cancel.assert_called_once_with()
+        mixer_mock.setvolume.assert_called_once_with(10)
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    @mock.patch("mopidy_alsamixer.mixer.VolumeFader")
+    def test_fade_step_after_actor_stopped_is_ignored(
+        self, fader_mock, actor_ref_mock, alsa_mock
+    ):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        alsa_mock.Mixer.return_value.getvolume.return_value = [20]
+        mixer.fade_volume(60, 200)
+        callback = fader_mock.call_args.kwargs["callback"]
+        actor_ref_mock.proxy.side_effect = pykka.ActorDeadError("stopped")
+
+        callback(30, last=False)
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    @mock.patch("mopidy_alsamixer.mixer.VolumeFader")
+    def test_set_volume_ramps_large_changes(
+        self, fader_mock, actor_ref_mock, alsa_mock
+    ):
+        config = {
+            "alsamixer": {
+                "volume_scale": "linear",
+                "ramp_threshold": 10,
+                "ramp_time": 100,
+            }
+        }
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [20]
+
+        mixer.set_volume(25)
+        mixer.set_volume(65)
+
+        mixer_mock.setvolume.assert_called_once_with(25)
+        fader_mock.assert_called_once_with(
+            volumes=[45, 65], interval=0.05, callback=mock.ANY, reactor=self.reactor
+        )
+
     def test_get_mute_when_muted(self, alsa_mock):
         mixer = self.get_mixer(alsa_mock)
         mixer_mock = alsa_mock.Mixer.return_value
@@ -321,3 +1145,354 @@ class MixerTest(unittest.TestCase):
         mixer_mock.getmute.assert_called_once_with()
         mixer.trigger_volume_changed.assert_called_once_with(75)
         mixer.trigger_mute_changed.assert_called_once_with(True)  # noqa: FBT003
+
+    def test_trigger_events_for_changed_values_from_state(self, alsa_mock):
+        config = {"alsamixer": {"volume_scale": "linear"}}
+        mixer = self.get_mixer(alsa_mock, config=config)
+        mixer.trigger_volume_changed = mock.Mock()
+        mixer.trigger_mute_changed = mock.Mock()
+
+        mixer.trigger_events_for_changed_values(
+            MixerState(volumes=(75, 75), mutes=(1, 1))
+        )
+
+        assert alsa_mock.Mixer.call_count == 0
+        mixer.trigger_volume_changed.assert_called_once_with(75)
+        mixer.trigger_mute_changed.assert_called_once_with(True)  # noqa: FBT003
+
+    def test_trigger_events_for_changed_values_from_state_without_mute(self, alsa_mock):
+        mixer = self.get_mixer(alsa_mock)
+        mixer.trigger_mute_changed = mock.Mock()
+
+        mixer.trigger_events_for_changed_values(MixerState(volumes=(75,), mutes=None))
+
+        assert alsa_mock.Mixer.call_count == 0
+        assert mixer.trigger_mute_changed.call_count == 0
+
+
+@mock.patch(
+    "mopidy_alsamixer.backend.alsaaudio",
+    spec=alsaaudio,
+    ALSAAudioError=alsaaudio.ALSAAudioError,
+)
+class ObserverTest(unittest.TestCase):
+    def start_observer(self, alsa_mock, **kwargs):
+        alsa_mock.Mixer.return_value.polldescriptors.return_value = [(5, 1)]
+        callback = mock.Mock()
+        reactor = mock.Mock(spec=Reactor)
+        observer = AlsaMixerObserver(
+            device="default",
+            control="Master",
+            callback=callback,
+            reactor=reactor,
+            **kwargs,
+        )
+        observer.start()
+        on_event = reactor.add.call_args.args[2]
+        return observer, callback, reactor, on_event
+
+    def end_window(self, reactor):
+        # Fire the most recently scheduled coalescing window timer
+        reactor.call_later.call_args.args[1]()
+
+    def test_registers_descriptors_edge_triggered(self, alsa_mock):
+        observer, _, reactor, _ = self.start_observer(alsa_mock)
+
+        reactor.add.assert_called_once_with(5, 1 | select.EPOLLET, mock.ANY)
+
+        observer.stop()
+
+        reactor.remove.assert_called_once_with(5)
+
+    def test_calls_callback_for_every_event_without_window(self, alsa_mock):
+        observer, callback, reactor, on_event = self.start_observer(
+            alsa_mock, coalesce_window=0
+        )
+
+        for _ in range(3):
+            on_event(1)
+
+        assert callback.call_count == 3
+        assert observer.suppressed_events == 0
+        reactor.call_later.assert_not_called()
+
+    def test_coalesces_events_within_window(self, alsa_mock):
+        observer, callback, reactor, on_event = self.start_observer(
+            alsa_mock, coalesce_window=0.05
+        )
+
+        on_event(1)
+        on_event(1)
+        on_event(1)
+        self.end_window(reactor)
+        self.end_window(reactor)
+        on_event(1)
+
+        # First event, end of the burst, and the event after the burst.
+        assert callback.call_count == 3
+        assert observer.suppressed_events == 2
+        assert reactor.call_later.call_count == 3
+
+    def test_ignores_events_after_stop(self, alsa_mock):
+        observer, callback, reactor, on_event = self.start_observer(
+            alsa_mock, coalesce_window=0.05
+        )
+        on_event(1)
+        timer = reactor.call_later.return_value
+
+        observer.stop()
+        on_event(1)
+
+        assert callback.call_count == 1
+        timer.cancel.assert_called_once_with()
+
+    def test_sends_state_read_from_observed_mixer(self, alsa_mock):
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [60, 60]
+        mixer_mock.getmute.return_value = [0, 0]
+        _, callback, _, on_event = self.start_observer(alsa_mock)
+
+        on_event(1)
+
+        mixer_mock.handleevents.assert_called_once_with()
+        callback.assert_called_once_with(MixerState(volumes=(60, 60), mutes=(0, 0)))
+
+    def test_sends_no_state_if_reading_fails(self, alsa_mock):
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.side_effect = alsa_mock.ALSAAudioError
+        _, callback, _, on_event = self.start_observer(alsa_mock)
+
+        on_event(1)
+
+        callback.assert_called_once_with(None)
+
+    def test_parks_when_device_hangs_up(self, alsa_mock):
+        connection_callback = mock.Mock()
+        observer, callback, reactor, on_event = self.start_observer(
+            alsa_mock, connection_callback=connection_callback
+        )
+
+        on_event(select.EPOLLHUP)
+
+        assert not observer.connected
+        callback.assert_not_called()
+        connection_callback.assert_called_once_with(False)  # noqa: FBT003
+        reactor.remove.assert_called_once_with(5)
+        alsa_mock.Mixer.return_value.close.assert_called_once_with()
+        reactor.call_later.assert_called_once_with(RECONNECT_MIN_DELAY, mock.ANY)
+
+    def test_parks_when_handling_events_fails(self, alsa_mock):
+        mixer_mock = alsa_mock.Mixer.return_value
+        observer, callback, _, on_event = self.start_observer(alsa_mock)
+        mixer_mock.handleevents.side_effect = alsa_mock.ALSAAudioError
+
+        on_event(1)
+
+        assert not observer.connected
+        callback.assert_not_called()
+
+    def test_reconnects_with_backoff(self, alsa_mock):
+        connection_callback = mock.Mock()
+        mixer_mock = alsa_mock.Mixer.return_value
+        observer, callback, reactor, on_event = self.start_observer(
+            alsa_mock, connection_callback=connection_callback
+        )
+        on_event(select.EPOLLERR)
+        alsa_mock.Mixer.side_effect = alsa_mock.ALSAAudioError
+
+        delays = []
+        for _ in range(10):
+            delay, reconnect = reactor.call_later.call_args.args
+            delays.append(delay)
+            reconnect()
+
+        assert delays[:4] == [
+            RECONNECT_MIN_DELAY,
+            RECONNECT_MIN_DELAY * 2,
+            RECONNECT_MIN_DELAY * 4,
+            RECONNECT_MIN_DELAY * 8,
+        ]
+        assert delays[-1] == RECONNECT_MAX_DELAY
+        assert not observer.connected
+
+        alsa_mock.Mixer.side_effect = None
+        mixer_mock.getvolume.return_value = [60, 60]
+        mixer_mock.getmute.return_value = [0, 0]
+        reactor.call_later.call_args.args[1]()
+
+        assert observer.connected
+        assert reactor.add.call_count == 2
+        assert connection_callback.call_args_list == [
+            mock.call(False),  # noqa: FBT003
+            mock.call(True),  # noqa: FBT003
+        ]
+        callback.assert_called_once_with(MixerState(volumes=(60, 60), mutes=(0, 0)))
+
+    def test_stop_cancels_reconnect(self, alsa_mock):
+        observer, _, reactor, on_event = self.start_observer(alsa_mock)
+        on_event(select.EPOLLHUP)
+        timer = reactor.call_later.return_value
+
+        observer.stop()
+        observer.close()
+
+        timer.cancel.assert_called_once_with()
+        assert reactor.remove.call_count == 1
+        alsa_mock.Mixer.return_value.close.assert_called_once_with()
+
+    def test_publishes_state_before_callback(self, alsa_mock):
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.getvolume.return_value = [60, 60]
+        mixer_mock.getmute.return_value = [0, 0]
+        calls = mock.Mock()
+        _, callback, _, on_event = self.start_observer(alsa_mock, publish=calls.publish)
+        callback.side_effect = calls.callback
+
+        on_event(1)
+
+        state = MixerState(volumes=(60, 60), mutes=(0, 0))
+        assert calls.mock_calls == [mock.call.publish(state), mock.call.callback(state)]
+
+    def test_watches_linked_controls(self, alsa_mock):
+        alsa_mock.Mixer.return_value.polldescriptors.side_effect = [[(5, 1)], [(6, 1)]]
+        reactor = mock.Mock(spec=Reactor)
+        observer = AlsaMixerObserver(
+            device="default",
+            control="Master",
+            linked=[("hw:1", "PCM")],
+            reactor=reactor,
+        )
+
+        observer.start()
+        observer.stop()
+        observer.close()
+
+        assert observer.descriptors == [(5, 1), (6, 1)]
+        assert reactor.add.call_count == 2
+        assert reactor.remove.call_args_list == [mock.call(5), mock.call(6)]
+
+    def test_drops_only_lost_linked_control(self, alsa_mock):
+        alsa_mock.Mixer.return_value.polldescriptors.side_effect = [[(5, 1)], [(6, 1)]]
+        reactor = mock.Mock(spec=Reactor)
+        connection_callback = mock.Mock()
+        linked_connection_callback = mock.Mock()
+        observer = AlsaMixerObserver(
+            device="default",
+            control="Master",
+            linked=[("hw:1", "PCM")],
+            reactor=reactor,
+            connection_callback=connection_callback,
+            linked_connection_callback=linked_connection_callback,
+        )
+        observer.start()
+        on_linked_event = reactor.add.call_args.args[2]
+
+        on_linked_event(select.EPOLLHUP)
+
+        assert observer.connected
+        assert observer.descriptors == [(5, 1)]
+        reactor.remove.assert_called_once_with(6)
+        connection_callback.assert_not_called()
+        linked_connection_callback.assert_called_once_with(0, False)  # noqa: FBT003
+        reactor.call_later.assert_called_once_with(RECONNECT_MIN_DELAY, mock.ANY)
+
+        alsa_mock.Mixer.return_value.polldescriptors.side_effect = [[(7, 1)]]
+        reactor.call_later.call_args.args[1]()
+
+        assert observer.descriptors == [(5, 1), (7, 1)]
+        reactor.add.assert_called_with(7, 1 | select.EPOLLET, mock.ANY)
+        linked_connection_callback.assert_called_with(0, True)  # noqa: FBT003
+        observer.stop()
+
+
+class VolumeFaderTest(unittest.TestCase):
+    def run_fader(self, fader, reactor):
+        # Fire the scheduled steps until no new one is scheduled
+        fader.start()
+        fired = 0
+        while reactor.call_later.call_count > fired:
+            fired += 1
+            reactor.call_later.call_args.args[1]()
+
+    def test_calls_callback_for_every_step(self):
+        callback = mock.Mock()
+        reactor = mock.Mock(spec=Reactor)
+        fader = VolumeFader(
+            volumes=[10, 20, 30], interval=0.1, callback=callback, reactor=reactor
+        )
+
+        self.run_fader(fader, reactor)
+
+        assert callback.call_args_list == [
+            mock.call(10, last=False),
+            mock.call(20, last=False),
+            mock.call(30, last=True),
+        ]
+        assert reactor.call_later.call_args_list == [mock.call(0.1, mock.ANY)] * 3
+
+    def test_stops_when_cancelled(self):
+        callback = mock.Mock()
+        reactor = mock.Mock(spec=Reactor)
+        fader = VolumeFader(
+            volumes=[10, 20, 30], interval=0, callback=callback, reactor=reactor
+        )
+        fader.start()
+        fader.cancel()
+
+        reactor.call_later.call_args.args[1]()
+
+        reactor.call_later.return_value.cancel.assert_called_once_with()
+        assert callback.call_count == 0
+
+
+@mock.patch(
+    "mopidy_alsamixer.backend.alsaaudio",
+    spec=alsaaudio,
+    ALSAAudioError=alsaaudio.ALSAAudioError,
+)
+class ObserverLifecycleTest(unittest.TestCase):
+    def test_stopped_observers_release_shared_reactor(self, alsa_mock):
+        descriptors = []
+        for _ in range(2):
+            read_fd, write_fd = os.pipe()
+            self.addCleanup(os.close, read_fd)
+            self.addCleanup(os.close, write_fd)
+            descriptors.append([(read_fd, select.EPOLLIN)])
+        mixer_mock = alsa_mock.Mixer.return_value
+        mixer_mock.polldescriptors.side_effect = descriptors
+        first = AlsaMixerObserver(device="default", control="Master")
+        second = AlsaMixerObserver(device="default", control="PCM")
+        first.start()
+        second.start()
+        threads = threading.active_count()
+
+        first.stop()
+        assert threading.active_count() == threads
+
+        start = time.monotonic()
+        second.stop()
+        first.close()
+        second.close()
+
+        assert threading.active_count() == threads - 1
+        assert time.monotonic() - start < 0.5
+        assert mixer_mock.close.call_count == 2
+
+    @mock.patch.object(AlsaMixer, "actor_ref")
+    @mock.patch("mopidy_alsamixer.mixer.AlsaMixerObserver")
+    def test_on_stop_stops_observer_and_closes_mixers(
+        self, observer_mock, actor_ref_mock, alsa_mock
+    ):
+        alsa_mock.cards.return_value = ["PCH"]
+        alsa_mock.mixers.return_value = ["Master"]
+        mixer = AlsaMixer(config=copy.deepcopy(MixerTest.default_config))
+        mixer.on_start()
+        mixer.get_volume()
+
+        mixer.on_stop()
+
+        observer = observer_mock.return_value
+        observer.start.assert_called_once_with()
+        observer.stop.assert_called_once_with()
+        observer.close.assert_called_once_with()
+        alsa_mock.Mixer.return_value.close.assert_called_once_with()
@@ -0,0 +1,87 @@
+import os
+import threading
+
+import pytest
+
+from mopidy_alsamixer.reactor import (
+    Reactor,
+    acquire_shared_reactor,
+    release_shared_reactor,
+)
+
+
+@pytest.fixture
+def reactor():
+    reactor = Reactor()
+    reactor.start()
+    yield reactor
+    reactor.stop()
+    reactor.join(timeout=1)
+    reactor.close()
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def test_calls_callback_when_descriptor_is_ready(reactor, pipe):
+    read_fd, write_fd = pipe
+    called = threading.Event()
+    reactor.add(read_fd, 1, lambda _events: called.set())
+
+    os.write(write_fd, b"x")
+
+    assert called.wait(timeout=1)
+
+
+def test_removed_descriptor_is_not_watched(reactor, pipe):
+    read_fd, write_fd = pipe
+    called = threading.Event()
+    reactor.add(read_fd, 1, lambda _events: called.set())
+    reactor.remove(read_fd)
+
+    os.write(write_fd, b"x")
+
+    assert not called.wait(timeout=0.05)
+
+
+def test_runs_timers_in_order(reactor):
+    calls = []
+    done = threading.Event()
+    reactor.call_later(0.02, lambda: (calls.append(2), done.set()))
+    reactor.call_later(0.01, lambda: calls.append(1))
+
+    assert done.wait(timeout=1)
+    assert calls == [1, 2]
+
+
+def test_cancelled_timer_is_not_run(reactor):
+    called = threading.Event()
+    timer = reactor.call_later(0.01, called.set)
+
+    timer.cancel()
+
+    assert not called.wait(timeout=0.05)
+
+
+def test_survives_failing_callback(reactor):
+    called = threading.Event()
+    reactor.call_later(0, lambda: 1 / 0)
+    reactor.call_later(0.01, called.set)
+
+    assert called.wait(timeout=1)
+
+
+def test_shared_reactor_is_reused_until_released():
+    first = acquire_shared_reactor()
+    second = acquire_shared_reactor()
+
+    assert first is second
+    release_shared_reactor()
+    assert first.is_alive()
+    release_shared_reactor()
+    assert not first.is_alive()
@@ -0,0 +1,158 @@
+import copy
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from mopidy_alsamixer.backend import MemoryBackend, MixerState
+from mopidy_alsamixer.mixer import AlsaMixer, AlsaMixerObserver
+from mopidy_alsamixer.replay import (
+    EventRecorder,
+    RecordingHeader,
+    make_backend,
+    read_recording,
+    replay,
+)
+from tests import test_mixer
+
+HEADER = RecordingHeader(
+    device="default", control="Master", raw=False, raw_range=(0, 87)
+)
+
+
+def record(path, states):
+    recorder = EventRecorder(path, HEADER)
+    for state in states:
+        recorder.record(state)
+    recorder.close()
+
+
+def test_recording_round_trip(tmp_path):
+    path = tmp_path / "events.jsonl"
+    states = [
+        MixerState(volumes=(40, 45), mutes=(0, 0)),
+        None,
+        MixerState(volumes=(50, 50), mutes=None),
+    ]
+
+    record(path, states)
+    header, events = read_recording(path)
+
+    assert header == HEADER
+    assert [state for _, state in events] == [states[0], states[2]]
+    assert events[0][0] <= events[1][0]
+
+
+def test_read_recording_fails_on_other_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"foo": "bar"}\n')
+
+    with pytest.raises(ValueError, match="not a mixer event recording"):
+        read_recording(path)
+
+
+def test_replay_writes_states_to_backend(tmp_path):
+    path = tmp_path / "events.jsonl"
+    record(
+        path,
+        [
+            MixerState(volumes=(40, 45), mutes=(0, 0)),
+            MixerState(volumes=(50, 60), mutes=(1, 0)),
+        ],
+    )
+    header, events = read_recording(path)
+    backend = make_backend(header, events)
+
+    assert replay(path, backend, speed=0) == 2
+
+    handle = backend.open("default", "Master")
+    assert handle.volume_range() == (0, 87)
+    assert handle.read_volumes(raw=True) == [44, 52]
+    assert handle.read_mutes() == [1, 0]
+
+
+def test_replay_can_be_stopped(tmp_path):
+    path = tmp_path / "events.jsonl"
+    record(path, [MixerState(volumes=(40, 40), mutes=(0, 0))])
+    stop = threading.Event()
+    stop.set()
+
+    assert replay(path, MemoryBackend(), speed=0, stop=stop) == 0
+
+
+def test_observer_records_wakeups(tmp_path):
+    path = tmp_path / "events.jsonl"
+    backend = MemoryBackend()
+    recorder = EventRecorder(path, HEADER)
+    delivered = threading.Event()
+    observer = AlsaMixerObserver(
+        device="default",
+        control="Master",
+        callback=lambda _: delivered.set(),
+        backend=backend,
+        recorder=recorder,
+    )
+    observer.start()
+    backend.open("default", "Master").write_volume(40)
+
+    assert delivered.wait(timeout=1)
+    observer.stop()
+    observer.close()
+    recorder.close()
+
+    _, events = read_recording(path)
+    assert [state for _, state in events] == [
+        MixerState(volumes=(40, 40), mutes=(0, 0))
+    ]
+
+
+@mock.patch.object(AlsaMixer, "actor_ref")
+@mock.patch("mopidy_alsamixer.mixer.AlsaMixerObserver")
+def test_mixer_records_events_if_configured(observer_mock, actor_ref_mock, tmp_path):
+    path = tmp_path / "events.jsonl"
+    config = copy.deepcopy(test_mixer.MixerTest.default_config)
+    config["alsamixer"]["record_events"] = str(path)
+    mixer = AlsaMixer(config=config, backend=MemoryBackend())
+
+    mixer.on_start()
+    recorder = observer_mock.call_args.kwargs["recorder"]
+    mixer.on_stop()
+
+    assert recorder.path == path
+    header, events = read_recording(path)
+    assert header.raw_range == (0, 255)
+    assert header.db_range == (-5100, 0)
+    assert events == []
+
+
+def test_mixer_sees_events_replayed_right_after_start(tmp_path):
+    path = tmp_path / "events.jsonl"
+    record(
+        path,
+        [
+            MixerState(volumes=(40, 40), mutes=(0, 0)),
+            MixerState(volumes=(50, 50), mutes=(0, 0)),
+            MixerState(volumes=(60, 60), mutes=(1, 1)),
+        ],
+    )
+    header, events = read_recording(path)
+    backend = make_backend(header, events)
+    config = copy.deepcopy(test_mixer.MixerTest.default_config)
+    config["alsamixer"].update(volume_scale="linear", coalesce_window=0, metrics=True)
+    actor_ref = AlsaMixer.start(config=config, backend=backend)
+    try:
+        proxy = actor_ref.proxy()
+        assert proxy.is_observing().get()
+        publisher = proxy.get_state_publisher().get()
+
+        assert replay(path, backend, speed=0) == 3
+
+        deadline = time.monotonic() + 1
+        while publisher.current.mute is not True and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert publisher.current.volume == 60
+        assert publisher.current.mute is True
+        assert proxy.get_stats().get()["counters"]["wakeups"] >= 1
+    finally:
+        actor_ref.stop()
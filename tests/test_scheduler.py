@@ -0,0 +1,128 @@
+from unittest import mock
+
+import pytest
+
+from mopidy_alsamixer.reactor import Reactor
+from mopidy_alsamixer.scheduler import ScheduledAction, Scheduler
+
+
+@pytest.fixture
+def clock():
+    with mock.patch("mopidy_alsamixer.scheduler.time") as time_mock:
+        time_mock.time.return_value = 1000.0
+        yield time_mock
+
+
+@pytest.fixture
+def reactor():
+    return mock.Mock(spec=Reactor)
+
+
+@pytest.fixture
+def run():
+    return mock.Mock()
+
+
+@pytest.fixture
+def scheduler(reactor, run):
+    return Scheduler(run=run, reactor=reactor)
+
+
+def fire_last_timer(reactor):
+    reactor.call_later.call_args.args[1]()
+
+
+def test_schedules_timer_for_action(clock, reactor, scheduler):
+    action = scheduler.schedule(1010.0, volume=30)
+
+    assert action == ScheduledAction(id=1, when=1010.0, volume=30)
+    reactor.call_later.assert_called_once_with(10.0, mock.ANY)
+
+
+def test_runs_one_shot_action_once(clock, reactor, run, scheduler):
+    action = scheduler.schedule(1010.0, mute=True)
+    clock.time.return_value = 1010.0
+
+    fire_last_timer(reactor)
+
+    run.assert_called_once_with(action)
+    assert scheduler.pending() == []
+
+
+def test_reschedules_recurring_action(clock, reactor, run, scheduler):
+    scheduler.schedule(1010.0, volume=10, interval=60)
+    clock.time.return_value = 1010.0
+
+    fire_last_timer(reactor)
+
+    run.assert_called_once()
+    assert [action.when for action in scheduler.pending()] == [1070.0]
+    reactor.call_later.assert_called_with(60.0, mock.ANY)
+
+
+def test_skips_missed_runs_of_recurring_action(clock, reactor, run, scheduler):
+    scheduler.schedule(1010.0, volume=10, interval=60)
+    clock.time.return_value = 1200.0
+
+    fire_last_timer(reactor)
+
+    assert run.call_count == 1
+    assert [action.when for action in scheduler.pending()] == [1250.0]
+
+
+def test_reschedules_action_if_timer_fires_early(clock, reactor, run, scheduler):
+    scheduler.schedule(1100.0, volume=10)
+    clock.time.return_value = 1050.0
+
+    fire_last_timer(reactor)
+
+    run.assert_not_called()
+    reactor.call_later.assert_called_with(50.0, mock.ANY)
+
+
+def test_recurring_action_firing_slightly_early_runs_once(
+    clock, reactor, run, scheduler
+):
+    scheduler.schedule(1100.0, volume=10, interval=60)
+    clock.time.return_value = 1099.5
+
+    fire_last_timer(reactor)
+
+    run.assert_called_once()
+    assert [action.when for action in scheduler.pending()] == [1160.0]
+
+
+def test_cancel(clock, reactor, run, scheduler):
+    action = scheduler.schedule(1010.0, volume=30)
+
+    assert scheduler.cancel(action.id)
+    assert not scheduler.cancel(action.id)
+    reactor.call_later.return_value.cancel.assert_called_once_with()
+    fire_last_timer(reactor)
+    run.assert_not_called()
+
+
+def test_lists_pending_actions_in_order(clock, scheduler):
+    later = scheduler.schedule(1020.0, volume=30)
+    sooner = scheduler.schedule(1010.0, mute=False)
+
+    assert scheduler.pending() == [sooner, later]
+
+
+def test_close_cancels_everything(clock, reactor, scheduler):
+    scheduler.schedule(1010.0, volume=30)
+    scheduler.schedule(1020.0, volume=40, interval=10)
+
+    scheduler.close()
+
+    assert scheduler.pending() == []
+    assert reactor.call_later.return_value.cancel.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"volume": 101}, {"volume": -1}, {"volume": 10, "interval": 0}],
+)
+def test_rejects_invalid_actions(clock, scheduler, kwargs):
+    with pytest.raises(ValueError):  # noqa: PT011
+        scheduler.schedule(1010.0, **kwargs)
@@ -0,0 +1,162 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from mopidy_alsamixer.backend import MemoryBackend, MixerState
+from mopidy_alsamixer.mixer import AlsaMixerObserver
+from mopidy_alsamixer.shared import SharedObserver, SharedStateFile
+
+STATE = MixerState(volumes=(40, 60), mutes=(0, 1))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "state"
+
+
+def test_state_file_round_trip(path):
+    writer = SharedStateFile(path)
+    reader = SharedStateFile(path)
+
+    writer.write(STATE, connected=True, raw=False)
+    first = reader.read()
+    writer.write(None, connected=False, raw=True)
+    second = reader.read()
+
+    assert first is not None
+    assert (first.state, first.connected, first.raw) == (STATE, True, False)
+    assert second is not None
+    assert (second.state, second.connected, second.raw) == (None, False, True)
+    assert second.generation == first.generation + 1
+    writer.close()
+    reader.close()
+
+
+def test_state_file_without_mutes(path):
+    state_file = SharedStateFile(path)
+
+    state_file.write(MixerState(volumes=(10,), mutes=None), connected=True, raw=True)
+
+    snapshot = state_file.read()
+    assert snapshot is not None
+    assert snapshot.state == MixerState(volumes=(10,), mutes=None)
+    state_file.close()
+
+
+def test_state_file_is_not_read_while_written(path):
+    state_file = SharedStateFile(path)
+    state_file.write(STATE, connected=True, raw=False)
+    # Sequence numbers are odd while a write is in progress
+    state_file._map[0] += 1  # noqa: SLF001
+
+    assert state_file.read() is None
+
+    # The next writer recovers from a leader dying in the middle of a write
+    state_file.write(STATE, connected=True, raw=False)
+    assert state_file.read() is not None
+    state_file.close()
+
+
+class Process:
+    """One of the processes sharing the state file."""
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.received = []
+        self.changed = threading.Event()
+        self.shared = SharedObserver(
+            path,
+            make_observer=self.make_observer,
+            callback=self.callback,
+            connection_callback=mock.Mock(),
+        )
+
+    def make_observer(self, publish, connection_callback):
+        return AlsaMixerObserver(
+            device="default",
+            control="Master",
+            backend=self.backend,
+            callback=self.callback,
+            publish=publish,
+            connection_callback=connection_callback,
+        )
+
+    def callback(self, state):
+        self.received.append(state)
+        self.changed.set()
+
+    def wait_for(self, state):
+        deadline = time.monotonic() + 1
+        while state not in self.received and time.monotonic() < deadline:
+            self.changed.wait(timeout=0.01)
+            self.changed.clear()
+        return state in self.received
+
+    def stop(self):
+        self.shared.stop()
+        self.shared.close()
+
+
+def test_follower_gets_state_from_leader(path):
+    backend = MemoryBackend()
+    leader = Process(backend, path)
+    follower = Process(backend, path)
+    leader.shared.start()
+    follower.shared.start()
+    opened = backend.opened
+
+    backend.open("default", "Master").write_state(STATE)
+
+    assert leader.wait_for(STATE)
+    assert follower.wait_for(STATE)
+    assert leader.shared.leading
+    assert not follower.shared.leading
+    # The follower did not open the control to observe it
+    assert backend.opened == opened + 1
+    follower.stop()
+    leader.stop()
+
+
+def test_follower_takes_over_when_leader_stops(path):
+    backend = MemoryBackend()
+    leader = Process(backend, path)
+    follower = Process(backend, path)
+    leader.shared.start()
+    follower.shared.start()
+
+    leader.stop()
+    deadline = time.monotonic() + 1
+    while not follower.shared.leading and time.monotonic() < deadline:
+        time.sleep(0.01)
+    backend.open("default", "Master").write_state(STATE)
+
+    assert follower.shared.leading
+    assert follower.wait_for(STATE)
+    follower.stop()
+
+
+def test_follower_reads_again_after_racing_with_writer(path):
+    backend = MemoryBackend()
+    leader = Process(backend, path)
+    follower = Process(backend, path)
+    leader.shared.start()
+    follower.shared.start()
+    read = SharedStateFile.read
+    failures = [None]
+
+    def racing_read(self):
+        # The first read after the doorbell gives up, as if the leader was
+        # preempted in the middle of the write
+        if failures:
+            return failures.pop()
+        return read(self)
+
+    with mock.patch.object(SharedStateFile, "read", racing_read):
+        backend.open("default", "Master").write_state(STATE)
+
+        assert follower.wait_for(STATE)
+    assert not failures
+    follower.stop()
+    leader.stop()
@@ -0,0 +1,41 @@
+from mopidy_alsamixer.state import StatePublisher
+
+
+def test_starts_unknown():
+    state = StatePublisher().current
+
+    assert (state.volume, state.mute, state.generation) == (None, None, 0)
+
+
+def test_publishing_replaces_state():
+    publisher = StatePublisher()
+    before = publisher.current
+
+    publisher.publish(40, mute=False)
+
+    assert before.volume is None
+    assert publisher.current.volume == 40
+    assert publisher.current.mute is False
+    assert publisher.current.generation == 1
+    assert publisher.current.timestamp >= before.timestamp
+
+
+def test_partial_updates_keep_other_value():
+    publisher = StatePublisher()
+    publisher.publish(40, mute=False)
+
+    publisher.publish_volume(50)
+    publisher.publish_mute(True)  # noqa: FBT003
+
+    assert (publisher.current.volume, publisher.current.mute) == (50, True)
+    assert publisher.current.generation == 3
+
+
+def test_unchanged_values_are_not_published():
+    publisher = StatePublisher()
+    publisher.publish(40, mute=False)
+    state = publisher.current
+
+    publisher.publish_volume(40)
+
+    assert publisher.current is state